@@ -1,7 +1,19 @@
 from graph import UndirectedGraph
 import numpy as np
+import pathlib
 import random
+import time
 from results import Results
+from pheromones import LazyPheromones, VertexPheromones, sum_by_index
+from checkpoint import (
+    SolverState,
+    save_checkpoint,
+    load_checkpoint,
+    save_pheromones_snapshot,
+    load_pheromones_snapshot,
+    pheromones_to_array,
+    snapshot_path,
+)
 
 
 class TauRange:
@@ -18,6 +30,47 @@ class TauRange:
         return self._t_min
 
 
+PHEROMONE_MODELS = ("edge", "vertex")
+
+
+def check_between_0_and_1(name, value):
+    if not (value >= 0 and value <= 1):
+        raise ValueError(f"{name} ({value}) deve estar no intervalo [0, 1]!")
+
+
+def check_positive_integer(name, value):
+    if not value > 0:
+        raise ValueError(f"{name} ({value}) deve ser um inteiro positivo!")
+
+
+def validate_params(
+    t_min, t_max, evap_r, n_ants, n_its, alpha, deposit_k=1, elite_weight=0.0
+):
+    """
+    Valida os parâmetros do ACOMaxClique vindos da linha de comando, do
+    solver ou do tuner, levantando ValueError no primeiro inválido.
+    """
+    if t_min > t_max:
+        raise ValueError(
+            f"t_min ({t_min}) não pode ser maior do que t_max ({t_max})!"
+        )
+
+    check_between_0_and_1("evap_r", evap_r)
+
+    check_positive_integer("n_ants", n_ants)
+
+    check_positive_integer("n_its", n_its)
+
+    check_positive_integer("alpha", alpha)
+
+    check_positive_integer("deposit_k", deposit_k)
+
+    if elite_weight < 0:
+        raise ValueError(
+            f"elite_weight ({elite_weight}) não pode ser negativo!"
+        )
+
+
 class ACOMaxClique:
     def __init__(
         self,
@@ -27,32 +80,152 @@ class ACOMaxClique:
         evap_r: float,
         t_range: TauRange,
         alpha: int,
+        lazy_evap: bool = False,
+        pheromone_model: str = "edge",
+        checkpoint_dir: pathlib.Path = None,
+        checkpoint_every: int = 0,
+        deposit_k: int = 1,
+        elite_weight: float = 0.0,
     ):
+        if pheromone_model not in PHEROMONE_MODELS:
+            raise ValueError(
+                f"pheromone_model ({pheromone_model}) deve ser um de "
+                f"{PHEROMONE_MODELS}!"
+            )
+        if lazy_evap and pheromone_model != "edge":
+            raise ValueError(
+                "lazy_evap só pode ser usado com o pheromone_model 'edge'!"
+            )
+        validate_params(
+            t_range.t_min,
+            t_range.t_max,
+            evap_r,
+            n_ants,
+            n_its,
+            alpha,
+            deposit_k,
+            elite_weight,
+        )
+
         self._graph = graph
         self._n_ants = n_ants
         self._n_its = n_its
         self._evap_rate = evap_r
         self._t_range = t_range
         self._alpha = alpha
+        self._lazy_evap = lazy_evap
+        self._pheromone_model = pheromone_model
+        self._checkpoint_dir = checkpoint_dir
+        self._checkpoint_every = checkpoint_every
+        self._deposit_k = deposit_k
+        self._elite_weight = elite_weight
+        self._edge_offsets = None
+        self._edge_keys = None
         self._results_tracker = None
+        self._pheromones = None
+        self._its_run = 0
+        self._it_to_best = 0
+        self._time_to_best = 0.0
+
+    @property
+    def pheromones(self):
+        """
+        Feromônios ao fim da última chamada de find_maximum_clique.
+        """
+        return self._pheromones
 
-    def find_maximum_clique(self) -> list:
+    @property
+    def its_run(self) -> int:
+        """
+        Número de iterações executadas na última chamada de find_maximum_clique.
+        """
+        return self._its_run
+
+    @property
+    def it_to_best(self) -> int:
+        """
+        Iteração em que o clique retornado pela última chamada de
+        find_maximum_clique foi encontrado.
+        """
+        return self._it_to_best
+
+    @property
+    def time_to_best(self) -> float:
+        """
+        Segundos desde o início da última chamada de find_maximum_clique até
+        encontrar o clique retornado.
+        """
+        return self._time_to_best
+
+    def find_maximum_clique(
+        self,
+        resume: bool = False,
+        pheromones=None,
+        time_limit: float = None,
+        known_cliques: list = None,
+        on_iteration=None,
+    ) -> list:
         """
         Tenta encontrar o maior clique possível ao simular caminhamentos de formigas de acordo
         com os feromônios que elas vão deixando no caminho.
+
+        Se checkpoint_dir e checkpoint_every foram definidos, salva o estado a cada
+        checkpoint_every iterações. Com resume, continua do último checkpoint salvo
+        em checkpoint_dir, se existir.
+
+        pheromones permite começar de feromônios já existentes, criados por
+        _init_pheromones com o mesmo grafo e modelo de feromônio, em vez dos
+        feromônios iniciais. Eles são modificados inplace.
+        Com time_limit (em segundos), para ao fim da iteração em que o tempo acabar.
+        known_cliques é uma lista de cliques já conhecidos que depositam feromônio
+        antes da primeira iteração. O maior deles é o clique máximo inicial.
+        Sem pheromones, os feromônios começam em t_min para que as arestas dos
+        known_cliques se destaquem.
+        on_iteration, se definido, é chamado ao fim de cada iteração com
+        (it, final_max_clique, cycle_max_clique, feromônio médio, segundos
+        gastos na iteração).
         """
+        start_time = time.monotonic()
         self._results_tracker = Results(self._graph.num_nodes)
-        pheromones_list = self._init_pheromones()
+        pheromones_list = pheromones
+        if pheromones_list is None and known_cliques:
+            # Com os feromônios iniciais em t_max, o depósito dos known_cliques
+            # seria cortado pelo t_max e não mudaria nenhum feromônio.
+            pheromones_list = self._init_pheromones(self._t_range.t_min)
+        elif pheromones_list is None:
+            pheromones_list = self._init_pheromones()
 
         final_max_clique = list()
-        for it in range(self._n_its):
+        if known_cliques:
+            final_max_clique = self._deposit_known_cliques(
+                pheromones_list, known_cliques
+            )
+
+        start_it = 0
+        if resume and self._checkpoint_dir is not None:
+            state = load_checkpoint(self._checkpoint_dir, pheromones_list)
+            if state is not None:
+                pheromones_list = state.pheromones
+                final_max_clique = state.final_max_clique
+                start_it = state.next_it
+                random.setstate(state.rng_state)
+                self._results_tracker = state.results_tracker
+
+        self._pheromones = pheromones_list
+        self._its_run = 0
+        self._it_to_best = start_it
+        self._time_to_best = 0.0
+        for it in range(start_it, self._n_its):
+            it_start_time = time.monotonic()
             cycle_max_clique = list()
+            ant_cliques = list()
 
             for _ in range(self._n_ants):
                 curr_ant_clique = self._find_ant_clique(pheromones_list)
                 self._results_tracker.add_clique_found_at_it(
                     curr_ant_clique, it
                 )
+                ant_cliques.append(curr_ant_clique)
 
                 if len(curr_ant_clique) > len(cycle_max_clique):
                     cycle_max_clique = curr_ant_clique
@@ -61,17 +234,118 @@ class ACOMaxClique:
 
             if len(cycle_max_clique) > len(final_max_clique):
                 final_max_clique = cycle_max_clique
+                self._it_to_best = it
+                self._time_to_best = time.monotonic() - start_time
 
-            self._deposit_pheromones(
-                pheromones_list, cycle_max_clique, final_max_clique
+            self._deposit_ranked_pheromones(
+                pheromones_list, ant_cliques, final_max_clique
             )
 
             self._results_tracker.calc_mean_pheromones_at_it(
                 pheromones_list, it
             )
 
+            if self._should_checkpoint(it):
+                save_checkpoint(
+                    self._checkpoint_dir,
+                    SolverState(
+                        pheromones_list,
+                        final_max_clique,
+                        it + 1,
+                        random.getstate(),
+                        self._results_tracker,
+                    ),
+                )
+
+            self._its_run += 1
+            if on_iteration is not None:
+                on_iteration(
+                    it,
+                    final_max_clique,
+                    cycle_max_clique,
+                    self._results_tracker.mean_pheromones_at_it(it),
+                    time.monotonic() - it_start_time,
+                )
+
+            if (
+                time_limit is not None
+                and time.monotonic() - start_time >= time_limit
+            ):
+                break
+
         return final_max_clique
 
+    def load_snapshot(self, snapshot_dir: pathlib.Path):
+        """
+        Retorna os feromônios salvos para o grafo em snapshot_dir por
+        save_snapshot, prontos para serem passados a find_maximum_clique.
+        Retorna None se não houver snapshot para o grafo.
+        """
+        return load_pheromones_snapshot(
+            snapshot_dir,
+            self._graph,
+            self._pheromone_model,
+            self._init_pheromones(),
+        )
+
+    def save_snapshot(self, snapshot_dir: pathlib.Path) -> pathlib.Path:
+        """
+        Salva em snapshot_dir os feromônios da última chamada de
+        find_maximum_clique, identificados pelo hash do grafo.
+        """
+        return save_pheromones_snapshot(
+            snapshot_dir, self._graph, self._pheromone_model, self._pheromones
+        )
+
+    def snapshot(self, snapshot_dir: pathlib.Path) -> tuple:
+        """
+        Retorna (caminho, np.array) do snapshot que save_snapshot salvaria,
+        sem escrever nada, para que outro processo o salve.
+        """
+        return (
+            snapshot_path(snapshot_dir, self._graph, self._pheromone_model),
+            pheromones_to_array(self._pheromones),
+        )
+
+    def _deposit_known_cliques(
+        self, pheromones_list: list[np.ndarray], known_cliques: list
+    ) -> list:
+        """
+        Deposita feromônios para cada clique de known_cliques como se ele
+        fosse o cycle_max_clique de uma iteração, usando o maior deles como
+        final_max_clique. Retorna o maior clique.
+        """
+        for clique in known_cliques:
+            if not self._is_clique(clique):
+                raise ValueError(f"{clique} não é um clique do grafo!")
+
+        best_clique = list(max(known_cliques, key=len))
+        for clique in known_cliques:
+            self._deposit_pheromones(pheromones_list, list(clique), best_clique)
+
+        return best_clique
+
+    def _is_clique(self, nodes: list) -> bool:
+        for node_idx, node in enumerate(nodes):
+            neighboors = self._graph.ordered_neighboors(node)
+            if neighboors is None:
+                return False
+
+            neighboors = set(neighboors)
+            for other_node in nodes[node_idx + 1:]:
+                if other_node not in neighboors:
+                    return False
+
+        return True
+
+    def _should_checkpoint(self, it: int) -> bool:
+        return (
+            self._checkpoint_dir is not None
+            and self._checkpoint_every > 0
+            and (it + 1) % self._checkpoint_every == 0
+            and it + 1 < self._n_its
+        )
+
     def _find_ant_clique(
         self, pheromones_list: list[np.ndarray], initial_node: int = None
     ) -> list:
@@ -98,7 +372,9 @@ class ACOMaxClique:
 
             candidates = self._update_candidates(candidates, ordered_neighboors)
 
-            candidate_pheromones = pheromones_list[curr_candidate - 1]
+            candidate_pheromones = None
+            if not isinstance(pheromones_list, VertexPheromones):
+                candidate_pheromones = pheromones_list[curr_candidate - 1]
             self._filter_and_att_cands_t_factor(
                 candidates,
                 cands_t_factor,
@@ -114,7 +390,7 @@ class ACOMaxClique:
         )
         return new_candidates
 
-    def _init_pheromones(self) -> list[np.ndarray]:
+    def _init_pheromones(self, t_init: float = None) -> list[np.ndarray]:
         """
         Inicia os feromônios para cada aresta.
         Retorna uma lista de np.arrays em que o índice na lista representa o índice -1 do nó
@@ -126,11 +402,36 @@ class ACOMaxClique:
         representam os feromônios para das arestas para os nós na seguinte ordem:
         [2,3,5,7,8]. Além disso, esse np.array estará no índice 0 da lista.
         Isso é feito pois o índice dos nós no arquivo de entrada começa em 1.
+
+        Com lazy_evap, retorna um LazyPheromones, que é indexado da mesma forma
+        mas evapora em O(1).
+
+        Com o pheromone_model 'vertex', retorna um VertexPheromones com um
+        feromônio por vértice.
+
+        Todos os feromônios começam em t_init, ou em t_max se t_init não for
+        passado.
         """
+        if t_init is None:
+            t_init = self._t_range.t_max
+
+        if self._pheromone_model == "vertex":
+            return VertexPheromones(
+                self._graph.num_nodes,
+                self._t_range.t_min,
+                self._t_range.t_max,
+                t_init,
+            )
+
+        if self._lazy_evap:
+            return LazyPheromones(
+                self._graph, self._t_range.t_min, self._t_range.t_max, t_init
+            )
+
         pheromones_list = list()
         for node_idx in range(1, self._graph.num_nodes + 1):
             edges_pheromones = np.zeros(self._graph.n_neighboors(node_idx))
-            edges_pheromones.fill(self._t_range.t_max)
+            edges_pheromones.fill(t_init)
             pheromones_list.append(edges_pheromones)
 
         return pheromones_list
@@ -143,12 +444,17 @@ class ACOMaxClique:
     ) -> dict:
         """
         Inicializa o fator de feromônio (tau) para cada candidato.
+        No modelo por vértice, o fator é o feromônio do próprio candidato.
         """
+        if isinstance(pheromones_list, VertexPheromones):
+            return {cand: pheromones_list[cand - 1] for cand in candidates}
+
         candidates_tau_factor = dict()
         ordered_neighboors = self._graph.ordered_neighboors(curr_node_id)
+        node_pheromones = pheromones_list[curr_node_id - 1]
         for candidate in candidates:
             candidate_idx = ordered_neighboors.index(candidate)
-            tau_factor = pheromones_list[curr_node_id - 1][candidate_idx]
+            tau_factor = node_pheromones[candidate_idx]
             candidates_tau_factor[candidate] = tau_factor
 
         return candidates_tau_factor
@@ -196,11 +502,14 @@ class ACOMaxClique:
         Para os nós j que permanecerem e forem vizinhos de curr_candidate,
         incrementa o seu t_factor baseado no feromônio associado à aresta que liga
         curr_candidate a j.
+        Se candidate_pheromones for None (modelo por vértice), apenas filtra.
         """
         target_keys = list(cands_t_factor.keys())
         for node in target_keys:
             if node not in candidates:
                 del cands_t_factor[node]
+            elif candidate_pheromones is None:
+                continue
             elif node in ordered_neighboors:
                 node_idx = ordered_neighboors.index(node)
                 cands_t_factor[node] += candidate_pheromones[node_idx]
@@ -211,6 +520,10 @@ class ACOMaxClique:
         definido em self._t_range.
         """
         persistence_rate = 1 - self._evap_rate
+        if isinstance(pheromones_list, (LazyPheromones, VertexPheromones)):
+            pheromones_list.evaporate(persistence_rate)
+            return
+
         mean_pheromones = 0
         count = 0
         for idx, edges_pheromones in enumerate(pheromones_list):
@@ -237,54 +550,134 @@ class ACOMaxClique:
         pheromone_to_add = 1 / (
             1 + len(final_max_clique) - len(cycle_max_clique)
         )
+        self._deposit_cliques(
+            pheromones_list, [cycle_max_clique], [pheromone_to_add]
+        )
 
-        nodes_already_treated = set()
-        for curr_node in cycle_max_clique:
-            node_neighs = self._graph.ordered_neighboors(curr_node)
-
-            for neigh_idx, neigh in enumerate(node_neighs):
-                if (
-                    neigh in cycle_max_clique
-                    and neigh not in nodes_already_treated
-                ):
-                    # att edge pheromone on curr_node list
-                    p_list_node_idx = curr_node - 1
-                    self._att_edge_pheromone(
-                        pheromones_list,
-                        pheromone_to_add,
-                        neigh_idx,
-                        p_list_node_idx,
-                    )
-
-                    # att edge pheromone on neigh list
-                    neigh_neighboors = self._graph.ordered_neighboors(neigh)
-                    curr_node_neigh_idx = neigh_neighboors.index(curr_node)
+    def _deposit_ranked_pheromones(
+        self,
+        pheromones_list: list[np.ndarray],
+        ant_cliques: list,
+        final_max_clique: list,
+    ):
+        """
+        Deposita feromônios nos deposit_k maiores cliques da iteração. O
+        clique de posição r (a partir de 0) deposita
+        (deposit_k - r)/deposit_k * 1/(1+len(final_max_clique)-len(clique)),
+        e o final_max_clique deposita mais elite_weight.
+        Com deposit_k 1 e elite_weight 0, é igual a _deposit_pheromones com o
+        cycle_max_clique.
+        """
+        ranked_cliques = sorted(ant_cliques, key=len, reverse=True)
+        cliques = list()
+        amounts = list()
+        for rank, clique in enumerate(ranked_cliques[: self._deposit_k]):
+            cliques.append(clique)
+            amounts.append(
+                (self._deposit_k - rank)
+                / self._deposit_k
+                / (1 + len(final_max_clique) - len(clique))
+            )
 
-                    self._att_edge_pheromone(
-                        pheromones_list,
-                        pheromone_to_add,
-                        curr_node_neigh_idx,
-                        neigh - 1,
-                    )
+        if self._elite_weight > 0:
+            cliques.append(final_max_clique)
+            amounts.append(self._elite_weight)
 
-            nodes_already_treated.add(curr_node)
+        self._deposit_cliques(pheromones_list, cliques, amounts)
 
-    def _att_edge_pheromone(
-        self,
-        pheromones_list: list[np.ndarray],
-        pheromone_to_add: float,
-        neigh_idx: int,
-        curr_node_idx: int,
+    def _deposit_cliques(
+        self, pheromones_list: list[np.ndarray], cliques: list, amounts: list
     ):
         """
-        Adds pheromone_to_add at the edge from curr_node_idx to neigh_idx in
-        pheromones_list. Modifies pheromones_list inplace
+        Deposita amounts[i] em cada aresta de cliques[i] (ou em cada vértice,
+        no modelo por vértice) de uma só vez: os depósitos de todos os
+        cliques são somados por aresta e o t_max é aplicado no mesmo passo.
+        Como os depósitos não são negativos, o resultado é o mesmo de
+        depositar um clique por vez.
         """
-        curr_pher = pheromones_list[curr_node_idx][neigh_idx]
-        new_pheromone = curr_pher + pheromone_to_add
-        pheromones_list[curr_node_idx][neigh_idx] = min(
-            [new_pheromone, self._t_range.t_max]
-        )
+        if isinstance(pheromones_list, VertexPheromones):
+            if len(cliques) > 0:
+                pheromones_list.add_many(
+                    np.concatenate(
+                        [np.asarray(c, dtype=np.int64) for c in cliques]
+                    ) - 1,
+                    np.concatenate(
+                        [np.full(len(c), a) for c, a in zip(cliques, amounts)]
+                    ),
+                )
+            return
+
+        edge_idxs, edge_amounts = self._clique_edges(cliques, amounts)
+        if isinstance(pheromones_list, LazyPheromones):
+            pheromones_list.add_many(edge_idxs, edge_amounts)
+            return
+
+        edge_idxs, edge_amounts = sum_by_index(edge_idxs, edge_amounts)
+        offsets, _ = self._edge_index()
+        rows = np.searchsorted(offsets, edge_idxs, side="right") - 1
+        row_starts = np.flatnonzero(np.diff(rows, prepend=-1))[1:]
+        for row, neigh_idxs, row_amounts in zip(
+            np.unique(rows).tolist(),
+            np.split(edge_idxs - offsets[rows], row_starts),
+            np.split(edge_amounts, row_starts),
+        ):
+            edges_pheromones = pheromones_list[row]
+            edges_pheromones[neigh_idxs] = np.minimum(
+                edges_pheromones[neigh_idxs] + row_amounts,
+                self._t_range.t_max,
+            )
+
+    def _clique_edges(self, cliques: list, amounts: list) -> tuple:
+        """
+        Retorna os índices, na ordem de pheromones_to_array, das arestas nos
+        dois sentidos de cada clique, e o amount de cada uma.
+        """
+        _, edge_keys = self._edge_index()
+        num_nodes = self._graph.num_nodes
+        clique_keys = [np.zeros(0, dtype=np.int64)]
+        clique_amounts = [np.zeros(0)]
+        for clique, amount in zip(cliques, amounts):
+            nodes = np.asarray(clique, dtype=np.int64) - 1
+            origins = np.repeat(nodes, nodes.shape[0])
+            dests = np.tile(nodes, nodes.shape[0])
+            is_edge = origins != dests
+            clique_keys.append(origins[is_edge] * num_nodes + dests[is_edge])
+            clique_amounts.append(np.full(np.count_nonzero(is_edge), amount))
+
+        edge_idxs = np.searchsorted(edge_keys, np.concatenate(clique_keys))
+        return edge_idxs, np.concatenate(clique_amounts)
+
+    def _edge_index(self) -> tuple:
+        """
+        Retorna (offsets, keys) das arestas na ordem de _init_pheromones:
+        as arestas de node_id começam em offsets[node_id - 1] e a aresta de
+        origem u para o destino v tem chave (u - 1) * num_nodes + (v - 1),
+        então keys é crescente e o índice de uma aresta é achado com
+        np.searchsorted. Calculado apenas uma vez.
+        """
+        if self._edge_offsets is None:
+            num_nodes = self._graph.num_nodes
+            neighboors = [
+                np.asarray(self._graph.ordered_neighboors(node_id), dtype=np.int64)
+                for node_id in range(1, num_nodes + 1)
+            ]
+            self._edge_offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+            np.cumsum(
+                [node_neighs.shape[0] for node_neighs in neighboors],
+                out=self._edge_offsets[1:],
+            )
+            self._edge_keys = np.concatenate(
+                [np.zeros(0, dtype=np.int64)]
+                + [
+                    node_idx * num_nodes + node_neighs - 1
+                    for node_idx, node_neighs in enumerate(neighboors)
+                ]
+            )
+
+        return self._edge_offsets, self._edge_keys
 
     def results_to_csv(self, path: str, delimiter=","):
         self._results_tracker.to_csv(path, delimiter)
+
+    def results_csv_lines(self, delimiter=",") -> list[str]:
+        return self._results_tracker.to_csv_lines(delimiter)
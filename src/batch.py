@@ -0,0 +1,268 @@
+import math
+import pathlib
+import statistics
+import time
+from multiprocessing import pool
+from solver import LRUCache
+from graph_io import COMPRESSED_SUFFIXES, read_graph, read_header
+from runner import (
+    init,
+    keep_best_snapshot,
+    run_aco,
+    save_snapshots,
+    write_run_results,
+    print_progress,
+    start_telemetry,
+    telemetry_reporter,
+)
+
+INSTANCE_SUFFIXES = (
+    ".col", ".clq", ".b", ".edges"
+) + COMPRESSED_SUFFIXES
+
+SUMMARY_HEADER = (
+    "instance nodes edges density runs best mean std "
+    "mean_it_to_best mean_time_to_best mean_time"
+).split()
+
+
+class Instance:
+    """
+    Uma instância do batch, com o tamanho lido apenas do cabeçalho do arquivo.
+    """
+
+    def __init__(self, path: pathlib.Path):
+        self.path = pathlib.Path(path)
+        self.num_nodes, self.num_edges = read_header(self.path)
+
+    @property
+    def name(self) -> str:
+        return instance_name(self.path)
+
+    @property
+    def density(self) -> float:
+        if self.num_nodes < 2:
+            return 0.0
+        return 2 * self.num_edges / (self.num_nodes * (self.num_nodes - 1))
+
+    def estimate_cost(self, n_ants: int, n_its: int) -> float:
+        """
+        Estima o custo de uma run. A cada iteração a evaporação percorre as E
+        arestas e cada formiga percorre cerca de grau médio * tamanho do
+        clique vizinhos, usando 2 log(N) / log(1 / densidade), o clique
+        esperado em um grafo aleatório, como tamanho do clique.
+        """
+        avg_degree = self.density * (self.num_nodes - 1)
+        if 0 < self.density < 1:
+            clique_size = 2 * math.log(self.num_nodes) / math.log(
+                1 / self.density
+            )
+        else:
+            clique_size = self.num_nodes * self.density
+        clique_size = max(clique_size, 1)
+
+        return n_its * (self.num_edges + n_ants * avg_degree * clique_size)
+
+
+def instance_name(path: pathlib.Path) -> str:
+    """
+    Nome da instância: o nome do arquivo sem a extensão de compressão e sem
+    a extensão do formato.
+    """
+    path = pathlib.Path(path)
+    if path.suffix in COMPRESSED_SUFFIXES:
+        path = path.with_suffix("")
+    return path.stem
+
+
+def list_instances(data_path: pathlib.Path) -> list[Instance]:
+    """
+    Se data_path for um diretório, retorna seus arquivos .col e .clq.
+    Senão, data_path é um manifesto com um caminho de instância por linha,
+    relativo ao diretório do manifesto. Linhas vazias ou iniciadas com '#'
+    são ignoradas.
+    """
+    data_path = pathlib.Path(data_path)
+    if data_path.is_dir():
+        paths = sorted(
+            path
+            for path in data_path.iterdir()
+            if path.suffix in INSTANCE_SUFFIXES
+        )
+    else:
+        paths = list()
+        with open(data_path, "r") as manifest:
+            for line in manifest:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                paths.append(data_path.parent / line)
+
+    for path in paths:
+        if not path.is_file():
+            raise ValueError(f"{path} não existe!")
+
+    instances = [Instance(path) for path in paths]
+    names = [instance.name for instance in instances]
+    if len(set(names)) != len(names):
+        raise ValueError("Duas instâncias do batch têm o mesmo nome!")
+
+    return instances
+
+
+def schedule_jobs(
+    instances: list[Instance], n_runs: int, n_ants: int, n_its: int
+) -> list:
+    """
+    Retorna os jobs (caminho da instância, run_id) das instâncias mais caras
+    para as mais baratas, para que as runs longas comecem primeiro e as
+    curtas preencham o fim. As runs de uma instância ficam juntas, então cada
+    worker costuma ler cada grafo uma única vez.
+    """
+    by_cost = sorted(
+        instances,
+        key=lambda instance: instance.estimate_cost(n_ants, n_its),
+        reverse=True,
+    )
+    return [
+        (str(instance.path), run_id)
+        for instance in by_cost
+        for run_id in range(n_runs)
+    ]
+
+
+def init_batch(args, timestr, telemetry_queue=None):
+    global worker_args, worker_timestr, worker_graphs
+    init(args, timestr, telemetry_queue)
+    worker_args = args
+    worker_timestr = timestr
+    worker_graphs = LRUCache(2)
+
+
+def run_job(job: tuple) -> dict:
+    """
+    Executa uma run de uma instância do batch no processo worker,
+    reaproveitando o grafo se o worker já o tiver lido.
+    """
+    data_path, run_id = job
+    data_path = pathlib.Path(data_path)
+    batch_dir = pathlib.Path(worker_args.t_dir) / worker_timestr
+    instance_dir = batch_dir / instance_name(data_path)
+    checkpoint_dir = instance_dir / "checkpoints" / f"run_{run_id}"
+
+    start_time = time.monotonic()
+    graph = worker_graphs.get(data_path)
+    if graph is None:
+        graph = read_graph(data_path)
+        worker_graphs.put(data_path, graph)
+
+    run_result = run_aco(
+        worker_args,
+        graph,
+        run_id,
+        checkpoint_dir,
+        start_time,
+        telemetry_reporter(f"{instance_name(data_path)}/{run_id}"),
+    )
+    run_result["instance"] = instance_name(data_path)
+    return run_result
+
+
+def summarize(instances: list[Instance], results: dict) -> list[list]:
+    """
+    Retorna uma linha de resumo, na ordem de SUMMARY_HEADER, por instância.
+    results mapeia o nome da instância para a lista de resultados das runs.
+    """
+    rows = list()
+    for instance in instances:
+        run_results = results.get(instance.name, [])
+        if len(run_results) == 0:
+            continue
+
+        sizes = [len(result["maximum_clique"]) for result in run_results]
+        rows.append(
+            [
+                instance.name,
+                instance.num_nodes,
+                instance.num_edges,
+                round(instance.density, 4),
+                len(run_results),
+                max(sizes),
+                round(statistics.mean(sizes), 3),
+                round(statistics.pstdev(sizes), 3),
+                round(
+                    statistics.mean(r["it_to_best"] for r in run_results), 1
+                ),
+                round(
+                    statistics.mean(r["time_to_best"] for r in run_results), 3
+                ),
+                round(statistics.mean(r["time"] for r in run_results), 3),
+            ]
+        )
+
+    return rows
+
+
+def write_summary(
+    path: pathlib.Path, rows: list[list], delimiter=",", header=SUMMARY_HEADER
+):
+    pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as summary_file:
+        summary_file.write(delimiter.join(header))
+        summary_file.write("\n")
+        for row in rows:
+            summary_file.write(delimiter.join(str(el) for el in row))
+            summary_file.write("\n")
+
+
+def print_summary(rows: list[list], header=SUMMARY_HEADER):
+    table = [header] + [[str(el) for el in row] for row in rows]
+    widths = [
+        max(len(row[col]) for row in table)
+        for col in range(len(header))
+    ]
+    for row in table:
+        print("  ".join(el.rjust(width) for el, width in zip(row, widths)))
+
+
+def run_batch(args):
+    """
+    Executa --n_r runs de cada instância de args.data_path em um único pool.
+    Cada run é escrita em <t_dir>/<timestr>/<instância>/run_<id>.csv e o
+    resumo por instância em <t_dir>/<timestr>/summary.csv.
+    """
+    instances = list_instances(args.data_path)
+    jobs = schedule_jobs(instances, args.n_r, args.n_ants, args.n_its)
+
+    timestr = time.strftime("%Y%m%d-%H%M%S")
+    batch_dir = pathlib.Path(args.t_dir) / timestr
+    n_p = max(min(args.n_p, len(jobs)), 1)
+
+    results = dict()
+    best_snapshots = dict()
+    telemetry_queue, aggregator = start_telemetry(args)
+    start_time = time.monotonic()
+    try:
+        with pool.Pool(
+            initializer=init_batch,
+            initargs=(args, timestr, telemetry_queue),
+            processes=n_p,
+        ) as runs_pool:
+            runs_done = 0
+            for run_result in runs_pool.imap_unordered(run_job, jobs):
+                keep_best_snapshot(best_snapshots, run_result)
+                instance_name = run_result["instance"]
+                write_run_results(batch_dir / instance_name, run_result)
+                results.setdefault(instance_name, list()).append(run_result)
+
+                runs_done += 1
+                print(instance_name, end=" ")
+                print_progress(run_result, runs_done, len(jobs), start_time)
+    finally:
+        if aggregator is not None:
+            aggregator.stop()
+
+    save_snapshots(best_snapshots)
+    rows = summarize(instances, results)
+    write_summary(batch_dir / "summary.csv", rows)
+    print_summary(rows)
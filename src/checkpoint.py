@@ -0,0 +1,204 @@
+import os
+import pathlib
+import pickle
+import shutil
+import tempfile
+import numpy as np
+from graph import UndirectedGraph
+from pheromones import LazyPheromones, VertexPheromones
+
+STATE_FILE = "state.pkl"
+
+
+class SolverState:
+    """
+    Estado completo de uma execução do ACOMaxClique entre duas iterações.
+    next_it é a próxima iteração a ser executada.
+    """
+
+    def __init__(
+        self,
+        pheromones,
+        final_max_clique: list,
+        next_it: int,
+        rng_state: tuple,
+        results_tracker,
+    ):
+        self.pheromones = pheromones
+        self.final_max_clique = final_max_clique
+        self.next_it = next_it
+        self.rng_state = rng_state
+        self.results_tracker = results_tracker
+
+
+def save_checkpoint(ckpt_dir: pathlib.Path, state: SolverState):
+    """
+    Salva state em ckpt_dir. Os feromônios vão para um .npy e o resto para
+    um pickle. Os dois arquivos são escritos atomicamente e o pickle, escrito
+    por último, aponta para o .npy da iteração, então um checkpoint
+    interrompido no meio nunca é lido.
+    """
+    ckpt_dir = pathlib.Path(ckpt_dir)
+    ckpt_dir.mkdir(parents=True, exist_ok=True)
+
+    pheromones_file = f"pheromones_{state.next_it}.npy"
+    pheromones_array = pheromones_to_array(state.pheromones)
+    atomic_write(
+        ckpt_dir / pheromones_file,
+        lambda file: np.save(file, pheromones_array),
+    )
+
+    meta = {
+        "pheromones_file": pheromones_file,
+        "final_max_clique": state.final_max_clique,
+        "next_it": state.next_it,
+        "rng_state": state.rng_state,
+        "results_tracker": state.results_tracker,
+    }
+    atomic_write(ckpt_dir / STATE_FILE, lambda file: pickle.dump(meta, file))
+
+    for old_file in ckpt_dir.glob("pheromones_*.npy"):
+        if old_file.name != pheromones_file:
+            old_file.unlink()
+
+
+def load_checkpoint(ckpt_dir: pathlib.Path, pheromones) -> SolverState:
+    """
+    Carrega o checkpoint de ckpt_dir. Os feromônios salvos são copiados para
+    pheromones, que deve ter sido criado por ACOMaxClique._init_pheromones
+    com o mesmo grafo e modelo de feromônio.
+    Retorna None se não houver checkpoint em ckpt_dir.
+    """
+    state_path = pathlib.Path(ckpt_dir) / STATE_FILE
+    if not state_path.is_file():
+        return None
+
+    with open(state_path, "rb") as state_file:
+        meta = pickle.load(state_file)
+
+    pheromones_array = np.load(
+        pathlib.Path(ckpt_dir) / meta["pheromones_file"], mmap_mode="r"
+    )
+    pheromones = load_pheromones_array(pheromones, pheromones_array)
+
+    return SolverState(
+        pheromones,
+        meta["final_max_clique"],
+        meta["next_it"],
+        meta["rng_state"],
+        meta["results_tracker"],
+    )
+
+
+def remove_checkpoint(ckpt_dir: pathlib.Path):
+    shutil.rmtree(ckpt_dir, ignore_errors=True)
+
+
+def snapshot_path(
+    snapshot_dir: pathlib.Path, graph: UndirectedGraph, pheromone_model: str
+) -> pathlib.Path:
+    """
+    Caminho do snapshot de feromônios de graph em snapshot_dir. O nome do
+    arquivo usa o hash do grafo, então snapshots de grafos diferentes nunca
+    se misturam.
+    """
+    file_name = f"{graph.content_hash()}_{pheromone_model}.npy"
+    return pathlib.Path(snapshot_dir) / file_name
+
+
+def save_pheromones_snapshot(
+    snapshot_dir: pathlib.Path,
+    graph: UndirectedGraph,
+    pheromone_model: str,
+    pheromones,
+) -> pathlib.Path:
+    """
+    Salva atomicamente os feromônios de graph em um .npy em snapshot_dir.
+    """
+    path = snapshot_path(snapshot_dir, graph, pheromone_model)
+    save_snapshot_array(path, pheromones_to_array(pheromones))
+    return path
+
+
+def save_snapshot_array(path: pathlib.Path, pheromones_array: np.ndarray):
+    """
+    Salva atomicamente pheromones_array, criado por pheromones_to_array, no
+    snapshot path.
+    """
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write(path, lambda file: np.save(file, pheromones_array))
+
+
+def load_pheromones_snapshot(
+    snapshot_dir: pathlib.Path,
+    graph: UndirectedGraph,
+    pheromone_model: str,
+    pheromones,
+):
+    """
+    Copia o snapshot de graph em snapshot_dir para pheromones e os retorna.
+    Retorna None se não houver snapshot para graph.
+    """
+    path = snapshot_path(snapshot_dir, graph, pheromone_model)
+    if not path.is_file():
+        return None
+
+    return load_pheromones_array(pheromones, np.load(path, mmap_mode="r"))
+
+
+def atomic_write(path: pathlib.Path, write_fn):
+    """
+    Escreve path com write_fn em um arquivo temporário único no mesmo
+    diretório e o move para path, então escritas concorrentes no mesmo path
+    nunca usam o mesmo temporário e path nunca fica pela metade.
+    """
+    path = pathlib.Path(path)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=path.parent, prefix=path.name + ".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as file:
+            write_fn(file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        pathlib.Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def pheromones_to_array(pheromones) -> np.ndarray:
+    """
+    Retorna os feromônios em um único np.array, qualquer que seja o modelo.
+    """
+    if isinstance(pheromones, (LazyPheromones, VertexPheromones)):
+        return pheromones.to_array()
+
+    if len(pheromones) == 0:
+        return np.zeros(0)
+    return np.concatenate(pheromones)
+
+
+def load_pheromones_array(pheromones, pheromones_array: np.ndarray):
+    """
+    Copia pheromones_array, criado por pheromones_to_array, para pheromones.
+    """
+    expected_size = pheromones_to_array(pheromones).shape[0]
+    if pheromones_array.shape[0] != expected_size:
+        raise ValueError(
+            f"Foram salvos {pheromones_array.shape[0]} feromônios, "
+            f"mas eram esperados {expected_size}!"
+        )
+
+    if isinstance(pheromones, (LazyPheromones, VertexPheromones)):
+        pheromones.load_array(pheromones_array)
+        return pheromones
+
+    start = 0
+    for idx, edges_pheromones in enumerate(pheromones):
+        end = start + edges_pheromones.shape[0]
+        pheromones[idx] = np.array(pheromones_array[start:end])
+        start = end
+
+    return pheromones
@@ -0,0 +1,282 @@
+from __future__ import annotations
+import argparse
+import pathlib
+import numpy as np
+from graph import UndirectedGraph
+
+GRAPH_KINDS = ("gnp", "brock", "phat")
+
+EDGES_FILE_MAGIC = b"MCEDGES1"
+_EDGES_HEADER_SIZE = len(EDGES_FILE_MAGIC) + 16
+
+
+class SyntheticGraph:
+    """
+    Gerador reprodutível de grafos com um clique plantado de tamanho conhecido.
+
+    kind define como a probabilidade de cada aresta (i, j) é escolhida:
+    - 'gnp': G(n, p), todas as arestas com probabilidade p.
+    - 'brock': como 'gnp', mas os nós do clique plantado têm menos arestas
+      para fora dele, de forma que seu grau esperado é igual ao dos outros
+      nós e o clique não se destaca pelo grau.
+    - 'phat': cada nó recebe uma densidade em [p_low, p_high] e a aresta
+      (i, j) tem probabilidade igual à média das densidades de i e j, o que
+      espalha bastante os graus.
+
+    As arestas são sorteadas em blocos pulando pares com saltos geométricos,
+    então o custo é proporcional ao número de arestas, e não a n².
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        num_nodes: int,
+        p: float = 0.5,
+        clique_size: int = 0,
+        p_low: float = 0.25,
+        p_high: float = 0.75,
+        seed: int = None,
+    ):
+        if kind not in GRAPH_KINDS:
+            raise ValueError(f"kind ({kind}) deve ser um de {GRAPH_KINDS}!")
+        if clique_size > num_nodes:
+            raise ValueError(
+                f"clique_size ({clique_size}) não pode ser maior do que "
+                f"num_nodes ({num_nodes})!"
+            )
+        for name, value in (("p", p), ("p_low", p_low), ("p_high", p_high)):
+            if not (value >= 0 and value <= 1):
+                raise ValueError(
+                    f"{name} ({value}) deve estar no intervalo [0, 1]!"
+                )
+        if p_low > p_high:
+            raise ValueError(
+                f"p_low ({p_low}) não pode ser maior do que p_high ({p_high})!"
+            )
+
+        self._kind = kind
+        self._num_nodes = num_nodes
+        self._p = p
+        self._seed = seed
+
+        rng = np.random.default_rng(seed)
+        self._planted_clique = np.sort(
+            rng.choice(num_nodes, clique_size, replace=False)
+        ) + 1
+        self._in_clique = np.zeros(num_nodes + 1, dtype=bool)
+        self._in_clique[self._planted_clique] = True
+
+        self._densities = None
+        if kind == "phat":
+            self._densities = rng.uniform(p_low, p_high, num_nodes + 1)
+
+        self._p_max = p_high if kind == "phat" else p
+        self._p_hidden = p
+        if kind == "brock" and clique_size < num_nodes:
+            self._p_hidden = max(
+                ((num_nodes - 1) * p - (clique_size - 1))
+                / (num_nodes - clique_size),
+                0.0,
+            )
+
+    @property
+    def num_nodes(self) -> int:
+        return self._num_nodes
+
+    @property
+    def planted_clique(self) -> list:
+        return self._planted_clique.tolist()
+
+    def edge_chunks(self, chunk_size: int = 1 << 20):
+        """
+        Gera np.arrays (m, 2) com as arestas (i, j), i < j, índices a partir
+        de 1. Cada aresta aparece uma única vez. As arestas do clique
+        plantado vêm no último bloco.
+        """
+        rng = np.random.default_rng(
+            None if self._seed is None else self._seed + 1
+        )
+        num_pairs = self._num_nodes * (self._num_nodes - 1) // 2
+
+        if self._p_max > 0:
+            last_pair = -1
+            while last_pair < num_pairs - 1:
+                gaps = rng.geometric(self._p_max, chunk_size)
+                pairs = last_pair + np.cumsum(gaps, dtype=np.int64)
+                last_pair = pairs[-1]
+                pairs = pairs[pairs < num_pairs]
+
+                edges = _pairs_to_edges(pairs, self._num_nodes)
+                accept_probs = self._edge_probs(edges) / self._p_max
+                accepted = rng.random(edges.shape[0]) < accept_probs
+                if np.any(accepted):
+                    yield edges[accepted]
+
+        clique = self._planted_clique
+        if clique.shape[0] > 1:
+            origins, dests = np.triu_indices(clique.shape[0], k=1)
+            yield np.stack([clique[origins], clique[dests]], axis=1)
+
+    def edges(self) -> np.ndarray:
+        chunks = list(self.edge_chunks())
+        if len(chunks) == 0:
+            return np.zeros((0, 2), dtype=np.int64)
+        return np.concatenate(chunks)
+
+    def to_graph(self) -> UndirectedGraph:
+        return UndirectedGraph.from_edges(self._num_nodes, self.edges())
+
+    def to_edges_file(self, path: pathlib.Path) -> int:
+        """
+        Escreve as arestas em path no formato binário de write_edges_file,
+        bloco a bloco. Retorna o número de arestas escritas.
+        """
+        return write_edges_file(path, self._num_nodes, self.edge_chunks())
+
+    def _edge_probs(self, edges: np.ndarray) -> np.ndarray:
+        origin_in = self._in_clique[edges[:, 0]]
+        dest_in = self._in_clique[edges[:, 1]]
+
+        if self._densities is not None:
+            probs = (
+                self._densities[edges[:, 0]] + self._densities[edges[:, 1]]
+            ) / 2
+        else:
+            probs = np.full(edges.shape[0], self._p)
+            probs[origin_in != dest_in] = self._p_hidden
+
+        # As arestas do clique plantado são adicionadas à parte
+        probs[origin_in & dest_in] = 0
+        return probs
+
+
+def _pairs_to_edges(pairs: np.ndarray, num_nodes: int) -> np.ndarray:
+    """
+    Converte índices lineares de pares (i, j), i < j, do triângulo superior da
+    matriz de adjacência, percorrido linha a linha, em arestas com índices a
+    partir de 1.
+    """
+    n = num_nodes
+    b = 2 * n - 1
+    origins = np.floor((b - np.sqrt(b * b - 8.0 * pairs)) / 2).astype(np.int64)
+    origins = np.clip(origins, 0, max(n - 2, 0))
+
+    # Corrige erros de arredondamento da raiz quadrada
+    row_start = origins * (b - origins) // 2
+    too_far = row_start > pairs
+    origins[too_far] -= 1
+    next_row_start = (origins + 1) * (b - origins - 1) // 2
+    too_short = next_row_start <= pairs
+    origins[too_short] += 1
+
+    row_start = origins * (b - origins) // 2
+    dests = pairs - row_start + origins + 1
+    return np.stack([origins + 1, dests + 1], axis=1)
+
+
+def write_edges_file(
+    path: pathlib.Path, num_nodes: int, edge_chunks
+) -> int:
+    """
+    Escreve as arestas de edge_chunks em um arquivo binário: o cabeçalho
+    EDGES_FILE_MAGIC, num_nodes e o número de arestas como int64 little-endian,
+    seguidos dos pares de nós como int32 little-endian.
+    Retorna o número de arestas escritas.
+    """
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    num_edges = 0
+    with open(path, "wb") as edges_file:
+        edges_file.write(EDGES_FILE_MAGIC)
+        edges_file.write(np.array([num_nodes, 0], dtype="<i8").tobytes())
+        for chunk in edge_chunks:
+            edges_file.write(np.asarray(chunk, dtype="<i4").tobytes())
+            num_edges += chunk.shape[0]
+
+        edges_file.seek(len(EDGES_FILE_MAGIC) + 8)
+        edges_file.write(np.array([num_edges], dtype="<i8").tobytes())
+
+    return num_edges
+
+
+def read_edges_file(path: pathlib.Path) -> tuple:
+    """
+    Lê um arquivo escrito por write_edges_file. Retorna num_nodes e um
+    np.memmap (m, 2) com as arestas.
+    """
+    with open(path, "rb") as edges_file:
+        magic = edges_file.read(len(EDGES_FILE_MAGIC))
+        if magic != EDGES_FILE_MAGIC:
+            raise ValueError(f"{path} não é um arquivo de arestas binário!")
+        num_nodes, num_edges = np.frombuffer(edges_file.read(16), dtype="<i8")
+
+    if num_edges == 0:
+        return int(num_nodes), np.zeros((0, 2), dtype="<i4")
+
+    edges = np.memmap(
+        path,
+        dtype="<i4",
+        mode="r",
+        offset=_EDGES_HEADER_SIZE,
+        shape=(int(num_edges), 2),
+    )
+    return int(num_nodes), edges
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MaxCliqueACO graph generator")
+    parser.add_argument("--kind", required=True, choices=GRAPH_KINDS)
+    parser.add_argument(
+        "--n", required=True, type=int, help="Number of nodes (int)"
+    )
+    parser.add_argument(
+        "--p",
+        required=False,
+        default=0.5,
+        type=float,
+        help="Edge probability for gnp and brock (float, default: 0.5)",
+    )
+    parser.add_argument(
+        "--p_low",
+        required=False,
+        default=0.25,
+        type=float,
+        help="Min node density for phat (float, default: 0.25)",
+    )
+    parser.add_argument(
+        "--p_high",
+        required=False,
+        default=0.75,
+        type=float,
+        help="Max node density for phat (float, default: 0.75)",
+    )
+    parser.add_argument(
+        "--clique_size",
+        required=False,
+        default=0,
+        type=int,
+        help="Size of the planted clique (int, default: 0)",
+    )
+    parser.add_argument(
+        "--seed", required=False, default=None, type=int, help="Random seed"
+    )
+    parser.add_argument(
+        "--out", required=True, type=str, help="The binary edges file to write"
+    )
+    args = parser.parse_args()
+
+    synthetic = SyntheticGraph(
+        args.kind,
+        args.n,
+        args.p,
+        args.clique_size,
+        args.p_low,
+        args.p_high,
+        args.seed,
+    )
+    num_edges = synthetic.to_edges_file(args.out)
+    print(
+        "Nodes:", args.n, " Edges:", num_edges,
+        " Planted clique:", synthetic.planted_clique,
+    )
@@ -1,6 +1,8 @@
 from __future__ import annotations
+import hashlib
 import pathlib
 import random
+import numpy as np
 
 
 class UndirectedGraph:
@@ -8,6 +10,7 @@ class UndirectedGraph:
         self._num_nodes = num_nodes
         self._num_edges = num_edges
         self._edge_dict = dict()
+        self._content_hash = None
 
         # Indices começando com 1
         for i in range(1, num_nodes + 1):
@@ -48,6 +51,7 @@ class UndirectedGraph:
 
         self._add_if_not_present(origin_node, dest_node)
         self._add_if_not_present(dest_node, origin_node)
+        self._content_hash = None
 
     def _add_if_not_present(self, origin_node: int, dest_node: int):
         edge_list: list = self._edge_dict[origin_node]
@@ -71,6 +75,51 @@ class UndirectedGraph:
         else:
             return None
 
+    def content_hash(self) -> str:
+        """
+        Retorna um hash hexadecimal que depende apenas dos nós e arestas do
+        grafo, e não do arquivo de onde ele foi lido.
+        """
+        if self._content_hash is None:
+            hasher = hashlib.sha1(str(self._num_nodes).encode())
+            for node_id in range(1, self._num_nodes + 1):
+                neighboors = self.ordered_neighboors(node_id)
+                hasher.update(",".join(map(str, neighboors)).encode())
+                hasher.update(b";")
+            self._content_hash = hasher.hexdigest()
+
+        return self._content_hash
+
+    @classmethod
+    def from_edges(cls, num_nodes: int, edges: np.ndarray) -> UndirectedGraph:
+        """
+        Cria uma instância a partir de um np.array (m, 2) com um par de nós
+        por linha, sem precisar adicionar aresta por aresta.
+        Arestas repetidas são contadas uma vez e arestas com nós fora de
+        [1, num_nodes] são ignoradas, como em add_edge.
+        """
+        graph_obj = UndirectedGraph(num_nodes, 0)
+
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        in_range = np.all((edges >= 1) & (edges <= num_nodes), axis=1)
+        edges = edges[in_range]
+
+        both_ways = np.concatenate([edges, edges[:, ::-1]])
+        both_ways = both_ways[np.lexsort((both_ways[:, 1], both_ways[:, 0]))]
+        if both_ways.shape[0] > 0:
+            is_new = np.ones(both_ways.shape[0], dtype=bool)
+            is_new[1:] = np.any(both_ways[1:] != both_ways[:-1], axis=1)
+            both_ways = both_ways[is_new]
+
+        counts = np.bincount(both_ways[:, 0], minlength=num_nodes + 1)
+        neighboors = np.split(both_ways[:, 1], np.cumsum(counts)[:-1])
+        for node_id in range(1, num_nodes + 1):
+            graph_obj._edge_dict[node_id] = neighboors[node_id].tolist()
+
+        self_loops = int(np.count_nonzero(both_ways[:, 0] == both_ways[:, 1]))
+        graph_obj._num_edges = (both_ways.shape[0] + self_loops) // 2
+        return graph_obj
+
     @classmethod
     def from_col_file(cls, file_path: pathlib.Path) -> UndirectedGraph:
         """
@@ -79,35 +128,43 @@ class UndirectedGraph:
         Linha inicia com 'p': Linha que define a quantidade de nós e arestas
         LInha inicia com 'e': Define um par de nós que forma uma aresta
         """
+        with open(file_path, "r") as col_file:
+            return cls.from_col_stream(col_file)
+
+    @classmethod
+    def from_col_stream(cls, col_file) -> UndirectedGraph:
+        """
+        Igual a from_col_file, mas lendo as linhas de um arquivo texto já
+        aberto, como um arquivo comprimido aberto com gzip.open.
+        """
         graph_obj = None
 
-        with open(file_path, "r") as col_file:
-            while True:
-                line = col_file.readline().strip()
-
-                if not line:
-                    break
-
-                elif line.startswith("c"):
-                    continue
-
-                elif line.startswith("p"):
-                    line_parts = line.split(" ")
-                    line_parts = cls._remove_empty(line_parts)
-                    num_nodes = int(line_parts[2])
-                    num_edges = int(line_parts[3])
-                    graph_obj = UndirectedGraph(num_nodes, num_edges)
-
-                elif line.startswith("e"):
-                    line_parts = line.split(" ")
-                    line_parts = cls._remove_empty(line_parts)
-                    origin_node = int(line_parts[1])
-                    dest_node = int(line_parts[2])
-                    graph_obj.add_edge(origin_node, dest_node)
-
-                else:
-                    print("WARNING: COULD NOT PARSE LINE: ", line)
-                    continue
+        while True:
+            line = col_file.readline().strip()
+
+            if not line:
+                break
+
+            elif line.startswith("c"):
+                continue
+
+            elif line.startswith("p"):
+                line_parts = line.split(" ")
+                line_parts = cls._remove_empty(line_parts)
+                num_nodes = int(line_parts[2])
+                num_edges = int(line_parts[3])
+                graph_obj = UndirectedGraph(num_nodes, num_edges)
+
+            elif line.startswith("e"):
+                line_parts = line.split(" ")
+                line_parts = cls._remove_empty(line_parts)
+                origin_node = int(line_parts[1])
+                dest_node = int(line_parts[2])
+                graph_obj.add_edge(origin_node, dest_node)
+
+            else:
+                print("WARNING: COULD NOT PARSE LINE: ", line)
+                continue
 
         return graph_obj
 
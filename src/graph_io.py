@@ -0,0 +1,295 @@
+from __future__ import annotations
+import bz2
+import contextlib
+import gzip
+import io
+import itertools
+import lzma
+import pathlib
+import re
+import numpy as np
+from graph import UndirectedGraph
+from generator import EDGES_FILE_MAGIC, read_edges_file
+
+GRAPH_FORMATS = ("col", "dimacs_bin", "edges", "edge_list")
+
+COMPRESSED_SUFFIXES = (".gz", ".bz2", ".xz")
+
+_COMPRESSION_MAGICS = (
+    (b"\x1f\x8b", gzip.open),
+    (b"BZh", bz2.open),
+    (b"\xfd7zXZ\x00", lzma.open),
+)
+
+_HEAD_SIZE = 4096
+
+
+def open_graph_file(path: pathlib.Path):
+    """
+    Abre path em modo binário, descomprimindo gzip, bzip2 ou xz de forma
+    transparente. O tipo de compressão é detectado pelos primeiros bytes, e
+    não pela extensão.
+    """
+    with open(path, "rb") as raw_file:
+        magic = raw_file.read(6)
+
+    for compression_magic, open_fn in _COMPRESSION_MAGICS:
+        if magic.startswith(compression_magic):
+            return open_fn(path, "rb")
+
+    return open(path, "rb")
+
+
+def detect_format(path: pathlib.Path) -> str:
+    """
+    Detecta o formato de path, depois de descomprimido, entre GRAPH_FORMATS:
+    - 'edges': arquivo binário de arestas de generator.write_edges_file.
+    - 'dimacs_bin': formato binário do DIMACS (.b), que começa com uma linha
+      contendo apenas o tamanho do preâmbulo, seguida do preâmbulo com uma
+      linha 'p'.
+    - 'col': formato texto do DIMACS, com linhas 'c', 'p' e 'e'.
+    - 'edge_list': um par de nós por linha, com uma linha opcional contendo
+      apenas o número de arestas no início.
+    """
+    with open_graph_file(path) as graph_file:
+        head = graph_file.read(_HEAD_SIZE)
+
+    if head.startswith(EDGES_FILE_MAGIC):
+        return "edges"
+
+    if _is_dimacs_binary(path, head):
+        return "dimacs_bin"
+
+    for line in head.split(b"\n"):
+        line = line.strip()
+        if not line:
+            continue
+        if line[:1] in (b"c", b"p", b"e"):
+            return "col"
+        break
+
+    return "edge_list"
+
+
+def read_graph(path: pathlib.Path) -> UndirectedGraph:
+    """
+    Lê um grafo em qualquer um dos formatos de GRAPH_FORMATS, comprimido ou
+    não.
+    """
+    path = pathlib.Path(path)
+    graph_format = detect_format(path)
+
+    if graph_format == "col":
+        if _is_compressed(path):
+            with open_graph_file(path) as graph_file:
+                with _text_stream(graph_file) as text_file:
+                    return UndirectedGraph.from_col_stream(text_file)
+        return UndirectedGraph.from_col_file(path)
+
+    if graph_format == "edges":
+        if _is_compressed(path):
+            with open_graph_file(path) as graph_file:
+                num_nodes, edges = _parse_edges_bytes(graph_file.read())
+        else:
+            num_nodes, edges = read_edges_file(path)
+        return UndirectedGraph.from_edges(num_nodes, edges)
+
+    with open_graph_file(path) as graph_file:
+        if graph_format == "dimacs_bin":
+            num_nodes, _, edges = read_dimacs_binary(graph_file)
+        else:
+            num_nodes, edges = read_edge_list(graph_file)
+
+    return UndirectedGraph.from_edges(num_nodes, edges)
+
+
+def read_header(path: pathlib.Path) -> tuple:
+    """
+    Retorna (num_nodes, num_edges) de path lendo apenas o cabeçalho, quando
+    o formato tem um. Listas de arestas precisam ser lidas por inteiro.
+    """
+    path = pathlib.Path(path)
+    graph_format = detect_format(path)
+
+    with open_graph_file(path) as graph_file:
+        if graph_format == "edges":
+            graph_file.read(len(EDGES_FILE_MAGIC))
+            num_nodes, num_edges = np.frombuffer(
+                graph_file.read(16), dtype="<i8"
+            )
+            return int(num_nodes), int(num_edges)
+
+        if graph_format == "dimacs_bin":
+            return _parse_p_line(_read_dimacs_preamble(graph_file))
+
+        if graph_format == "col":
+            with _text_stream(graph_file) as text_file:
+                for line in text_file:
+                    line = line.strip()
+                    if line.startswith("p"):
+                        return _parse_p_line(line)
+                    if line.startswith("e"):
+                        break
+            raise ValueError(f"{path} não tem uma linha 'p'!")
+
+        num_nodes, edges = read_edge_list(graph_file)
+        return num_nodes, edges.shape[0]
+
+
+def read_dimacs_binary(binary_file) -> tuple:
+    """
+    Lê o formato binário do DIMACS: uma linha com o tamanho do preâmbulo,
+    o preâmbulo em texto (linhas 'c' e a linha 'p') e a metade inferior da
+    matriz de adjacência, uma linha i por vez com (i + 8) // 8 bytes, em
+    que o bit mais significativo do primeiro byte é a coluna 0.
+    Retorna num_nodes, o num_edges do preâmbulo e um np.array (m, 2) com as
+    arestas (i, j), i > j, com índices a partir de 1.
+    """
+    num_nodes, num_edges = _parse_p_line(_read_dimacs_preamble(binary_file))
+
+    bitmap = np.frombuffer(binary_file.read(), dtype=np.uint8)
+    row_sizes = (np.arange(num_nodes) + 8) // 8
+    row_starts = np.concatenate([[0], np.cumsum(row_sizes)])
+    if bitmap.shape[0] < row_starts[-1]:
+        raise ValueError("O arquivo binário do DIMACS está truncado!")
+
+    edges = list()
+    for row in range(num_nodes):
+        row_bits = np.unpackbits(bitmap[row_starts[row]:row_starts[row + 1]])
+        cols = np.flatnonzero(row_bits[:row])
+        if cols.shape[0] > 0:
+            edges.append(
+                np.stack([np.full(cols.shape[0], row + 1), cols + 1], axis=1)
+            )
+
+    if len(edges) == 0:
+        return num_nodes, num_edges, np.zeros((0, 2), dtype=np.int64)
+    return num_nodes, num_edges, np.concatenate(edges)
+
+
+def write_dimacs_binary(
+    path: pathlib.Path, num_nodes: int, edges: np.ndarray, comments=()
+):
+    """
+    Escreve edges no formato binário do DIMACS lido por read_dimacs_binary.
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2) - 1
+    rows = edges.max(axis=1)
+    cols = edges.min(axis=1)
+    not_loop = rows != cols
+    rows = rows[not_loop]
+    cols = cols[not_loop]
+
+    row_sizes = (np.arange(num_nodes) + 8) // 8
+    row_starts = np.concatenate([[0], np.cumsum(row_sizes)])
+    bits = np.zeros(row_starts[-1] * 8, dtype=np.uint8)
+    bits[row_starts[rows] * 8 + cols] = 1
+    num_edges = int(np.count_nonzero(bits))
+
+    preamble = "".join(f"c {comment}\n" for comment in comments)
+    preamble += f"p edge {num_nodes} {num_edges}\n"
+    preamble = preamble.encode()
+
+    with open(path, "wb") as binary_file:
+        binary_file.write(f"{len(preamble)}\n".encode())
+        binary_file.write(preamble)
+        binary_file.write(np.packbits(bits).tobytes())
+
+
+def read_edge_list(binary_file) -> tuple:
+    """
+    Lê uma lista de arestas em texto, um par de nós separados por espaços ou
+    tabs por linha. Linhas iniciadas com '#' ou '%' são ignoradas, assim como
+    uma primeira linha com apenas um inteiro, o número de arestas. Se algum
+    nó for 0, os índices são considerados a partir de 0 e somados a 1.
+    Retorna num_nodes, o maior índice de nó, e um np.array (m, 2).
+    """
+    with _text_stream(binary_file) as text_file:
+        first_line = text_file.readline()
+        lines = text_file
+        if not re.fullmatch(r"\s*\d+\s*", first_line):
+            lines = itertools.chain([first_line], text_file)
+        edges = np.loadtxt(
+            lines,
+            dtype=np.int64,
+            comments=("#", "%"),
+            usecols=(0, 1),
+            ndmin=2,
+        )
+    if edges.shape[0] == 0:
+        return 0, edges.reshape(0, 2)
+
+    if edges.min() == 0:
+        edges = edges + 1
+    return int(edges.max()), edges
+
+
+def _is_dimacs_binary(path: pathlib.Path, head: bytes) -> bool:
+    """
+    Verifica se o arquivo, cujos primeiros bytes são head, começa com o
+    tamanho do preâmbulo do formato binário do DIMACS e se o preâmbulo
+    declarado cabe no arquivo e tem uma linha 'p'. Uma lista de arestas cuja
+    primeira linha é o número de arestas também começa com um inteiro.
+    """
+    first_line, _, rest = head.partition(b"\n")
+    if not re.fullmatch(rb"\d+", first_line.strip()):
+        return False
+
+    preamble_size = int(first_line.strip())
+    if preamble_size > len(rest):
+        with open_graph_file(path) as graph_file:
+            graph_file.readline()
+            rest = graph_file.read(preamble_size)
+        if len(rest) < preamble_size:
+            return False
+
+    preamble = rest[:preamble_size]
+    return any(
+        line.strip().startswith(b"p") for line in preamble.split(b"\n")
+    )
+
+
+@contextlib.contextmanager
+def _text_stream(binary_file):
+    """
+    Lê binary_file como texto. Ao sair, o io.TextIOWrapper é desacoplado,
+    sem fechar binary_file, que continua sendo de quem o abriu.
+    """
+    text_file = io.TextIOWrapper(binary_file)
+    try:
+        yield text_file
+    finally:
+        text_file.detach()
+
+
+def _read_dimacs_preamble(binary_file) -> str:
+    preamble_size = int(binary_file.readline().strip())
+    return binary_file.read(preamble_size).decode()
+
+
+def _parse_p_line(text: str) -> tuple:
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("p"):
+            line_parts = line.split()
+            return int(line_parts[2]), int(line_parts[3])
+
+    raise ValueError("O cabeçalho não tem uma linha 'p'!")
+
+
+def _parse_edges_bytes(content: bytes) -> tuple:
+    header_size = len(EDGES_FILE_MAGIC) + 16
+    num_nodes, num_edges = np.frombuffer(
+        content[len(EDGES_FILE_MAGIC):header_size], dtype="<i8"
+    )
+    edges = np.frombuffer(content[header_size:], dtype="<i4")
+    return int(num_nodes), edges.reshape(int(num_edges), 2)
+
+
+def _is_compressed(path: pathlib.Path) -> bool:
+    with open(path, "rb") as raw_file:
+        magic = raw_file.read(6)
+    return any(
+        magic.startswith(compression_magic)
+        for compression_magic, _ in _COMPRESSION_MAGICS
+    )
@@ -1,17 +1,35 @@
 import argparse
 import pathlib
-from graph import UndirectedGraph
-from aco import TauRange, ACOMaxClique
+from aco import PHEROMONE_MODELS, check_positive_integer, validate_params
+from runner import (
+    init,
+    keep_best_snapshot,
+    print_progress,
+    run,
+    save_snapshots,
+    start_telemetry,
+    write_run_results,
+)
 
 import time
-from multiprocessing import Lock, pool, current_process
+from multiprocessing import pool
 
 
 def config_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="MaxCliqueACO")
 
     parser.add_argument(
-        "--data_path", required=True, help="The graph .col file"
+        "--data_path",
+        required=True,
+        help="The graph file (.col, DIMACS .b, edge list, optionally gzip/bz2/xz \
+                            compressed), or with --batch a dir of instances or a \
+                            manifest file with one instance path per line",
+    )
+
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Run --n_r runs of every instance in --data_path on a single pool",
     )
 
     parser.add_argument(
@@ -62,6 +80,38 @@ def config_arg_parser() -> argparse.ArgumentParser:
         help="The pheromone factor weight (int, default:1)",
     )
 
+    parser.add_argument(
+        "--lazy_evap",
+        action="store_true",
+        help="Evaporate pheromones lazily with a global decay factor",
+    )
+
+    parser.add_argument(
+        "--pheromone_model",
+        required=False,
+        default="edge",
+        choices=PHEROMONE_MODELS,
+        help="Where to store pheromone: per edge or per vertex (str, default: edge)",
+    )
+
+    parser.add_argument(
+        "--deposit_k",
+        required=False,
+        default=1,
+        type=int,
+        help="Number of best ants of each iteration that deposit pheromone, \
+                            weighted by rank (int, default: 1)",
+    )
+
+    parser.add_argument(
+        "--elite_weight",
+        required=False,
+        default=0.0,
+        type=float,
+        help="Extra pheromone deposited on the best clique found so far at \
+                            each iteration, 0 disables it (float, default: 0.0)",
+    )
+
     parser.add_argument(
         "--n_p",
         required=False,
@@ -87,67 +137,176 @@ def config_arg_parser() -> argparse.ArgumentParser:
                             (str, default: ./results)",
     )
 
-    return parser
+    parser.add_argument(
+        "--checkpoint_every",
+        required=False,
+        default=0,
+        type=int,
+        help="Save a checkpoint of each run every N iterations, 0 disables it \
+                            (int, default: 0)",
+    )
 
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume the latest results dir in --t_dir from its checkpoints, \
+                            skipping the runs that already finished",
+    )
 
-def check_between_0_and_1(name, value):
-    if not (value >= 0 and value <= 1):
-        raise ValueError(f"{name} ({value}) deve estar no intervalo [0, 1]!")
+    parser.add_argument(
+        "--snapshot_dir",
+        required=False,
+        default=None,
+        type=str,
+        help="Start from the pheromone snapshot of this graph in this dir, if any, \
+                            and save the final pheromones of the best run there (str, default: None)",
+    )
 
+    parser.add_argument(
+        "--known_cliques",
+        required=False,
+        default=None,
+        type=str,
+        help="File with one known clique per line (space separated nodes) that \
+                            deposit pheromone before the first iteration (str, default: None)",
+    )
 
-def check_positive_integer(name, value):
-    if not value > 0:
-        raise ValueError(f"{name} ({value}) deve ser um inteiro positivo!")
+    parser.add_argument(
+        "--telemetry_log",
+        required=False,
+        default=None,
+        type=str,
+        help="Append the per-iteration metrics of every run to this JSON lines \
+                            file (str, default: None)",
+    )
+
+    parser.add_argument(
+        "--telemetry_port",
+        required=False,
+        default=None,
+        type=int,
+        help="Serve the latest metrics of every run as JSON on 127.0.0.1:PORT \
+                            (int, default: None)",
+    )
+
+    parser.add_argument(
+        "--telemetry_socket",
+        required=False,
+        default=None,
+        type=str,
+        help="Serve the latest metrics of every run as JSON on this Unix socket \
+                            (str, default: None)",
+    )
+
+    parser.add_argument(
+        "--telemetry_every",
+        required=False,
+        default=1,
+        type=int,
+        help="Send the metrics of a run every N iterations (int, default: 1)",
+    )
+
+    return parser
 
 
 def validate_args(args) -> bool:
     data_path = pathlib.Path(args.data_path)
-    if not data_path.is_file():
+    if not data_path.is_file() and not (args.batch and data_path.is_dir()):
         raise ValueError(f"{data_path} não existe!")
 
     # if not data_path.suffix == ".col":
     #     raise ValueError(f"{data_path} não é um arquivo .col!")
 
-    if args.t_min > args.t_max:
-        raise ValueError(
-            f"t_min ({args.t_min}) não pode ser maior do que t_max ({args.t_max})!"
-        )
-
-    # check_between_0_and_1("t_min", args.t_min)
+    validate_params(
+        args.t_min,
+        args.t_max,
+        args.evap_r,
+        args.n_ants,
+        args.n_its,
+        args.alpha,
+        args.deposit_k,
+        args.elite_weight,
+    )
 
-    # check_between_0_and_1("t_max", args.t_max)
+    check_positive_integer("telemetry_every", args.telemetry_every)
 
-    check_between_0_and_1("evap_r", args.evap_r)
+    if args.known_cliques is not None:
+        known_cliques_path = pathlib.Path(args.known_cliques)
+        if not known_cliques_path.is_file():
+            raise ValueError(f"{known_cliques_path} não existe!")
 
-    check_positive_integer("n_ants", args.n_ants)
+    if args.checkpoint_every < 0:
+        raise ValueError(
+            f"checkpoint_every ({args.checkpoint_every}) não pode ser negativo!"
+        )
 
-    check_positive_integer("n_its", args.n_its)
+    if args.lazy_evap and args.pheromone_model != "edge":
+        raise ValueError(
+            "--lazy_evap só pode ser usado com --pheromone_model edge!"
+        )
 
-    check_positive_integer("alpha", args.alpha)
+    if args.batch and (args.resume or args.known_cliques is not None):
+        raise ValueError(
+            "--batch não pode ser usado com --resume ou --known_cliques!"
+        )
 
 
-def run(args, run_id, timestr):
-    data_path = pathlib.Path(args.data_path)
-    graph = UndirectedGraph.from_col_file(data_path)
-    t_range = TauRange(args.t_min, args.t_max)
-    aco = ACOMaxClique(
-        graph, args.n_ants, args.n_its, args.evap_r, t_range, args.alpha
-    )
-    maximum_clique = aco.find_maximum_clique()
-
-    with lock:
-        print(
-            "(R:", run_id, ", ", current_process().name,
-            ")\n Maximum Clique:", maximum_clique,
-            " Total nodes: ", len(maximum_clique),
-            flush=True,
+def latest_timestr(t_dir: pathlib.Path) -> str:
+    """
+    Retorna o nome do diretório de resultados mais recente em t_dir que ainda
+    tem checkpoints.
+    """
+    t_dir = pathlib.Path(t_dir)
+    candidates = []
+    if t_dir.is_dir():
+        candidates = sorted(
+            run_dir.name
+            for run_dir in t_dir.iterdir()
+            if (run_dir / "checkpoints").is_dir()
         )
-    
-    aco.results_to_csv(pathlib.Path(args.t_dir) / f"{timestr}/run_{run_id}.csv")
 
-def init(l):
-    global lock
-    lock = l
+    if len(candidates) == 0:
+        raise ValueError(f"Nenhum checkpoint encontrado em {t_dir}!")
+
+    return candidates[-1]
+
+
+def run_single(args):
+    if args.resume:
+        timestr = latest_timestr(args.t_dir)
+    else:
+        timestr = time.strftime("%Y%m%d-%H%M%S")
+    run_dir = pathlib.Path(args.t_dir) / timestr
+
+    run_ids = [
+        run_id
+        for run_id in range(args.n_r)
+        if not (args.resume and (run_dir / f"run_{run_id}.csv").is_file())
+    ]
+
+    n_p = max(min(args.n_p, len(run_ids)), 1)
+
+    best_snapshots = dict()
+    telemetry_queue, aggregator = start_telemetry(args)
+    start_time = time.monotonic()
+    try:
+        with pool.Pool(
+            initializer=init,
+            initargs=(args, timestr, telemetry_queue),
+            processes=n_p,
+        ) as runs_pool:
+            runs_done = 0
+            for run_result in runs_pool.imap_unordered(run, run_ids):
+                keep_best_snapshot(best_snapshots, run_result)
+                write_run_results(run_dir, run_result)
+                runs_done += 1
+                print_progress(run_result, runs_done, len(run_ids), start_time)
+    finally:
+        if aggregator is not None:
+            aggregator.stop()
+
+    save_snapshots(best_snapshots)
+
 
 if __name__ == "__main__":
     parser = config_arg_parser()
@@ -155,15 +314,10 @@ if __name__ == "__main__":
 
     validate_args(args)
     print(args)
-    
-    write_results_lock = Lock()
 
-    if args.n_p > args.n_r:
-        args.n_p = args.n_r
+    if args.batch:
+        from batch import run_batch
 
-    timestr = time.strftime("%Y%m%d-%H%M%S")
-    with pool.Pool(initializer=init, initargs=(write_results_lock,), processes=args.n_p) as pool:
-        pool.starmap(
-            run,
-            [(args, run_id, timestr) for run_id in range(args.n_r)],
-        )
+        run_batch(args)
+    else:
+        run_single(args)
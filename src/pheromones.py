@@ -0,0 +1,277 @@
+import heapq
+import itertools
+import numpy as np
+from graph import UndirectedGraph
+
+# Abaixo desse fator de decaimento global os valores armazenados são
+# renormalizados, evitando que cresçam até estourar o float64.
+_RENORM_THRESHOLD = 1e-100
+
+
+def sum_by_index(idxs: np.ndarray, amounts: np.ndarray) -> tuple:
+    """
+    Soma os amounts com o mesmo índice. Retorna os índices únicos, em ordem
+    crescente, e a soma de cada um.
+    """
+    idxs = np.asarray(idxs, dtype=np.int64)
+    unique_idxs, inverse = np.unique(idxs, return_inverse=True)
+    sums = np.bincount(
+        inverse, weights=amounts, minlength=unique_idxs.shape[0]
+    )
+    return unique_idxs, sums
+
+
+class LazyPheromones:
+    """
+    Feromônios por aresta com evaporação preguiçosa.
+
+    Os valores são guardados divididos por um fator de decaimento global
+    (persistence_rate ** it), então evaporar custa O(1): basta multiplicar
+    o fator. O t_min é aplicado na leitura, já que
+    max(max(p*r, t_min)*r, t_min) == max(p*r*r, t_min), e o t_max é
+    aplicado na escrita, quando o feromônio é depositado.
+
+    Indexar com o índice do nó - 1 devolve um np.array com os feromônios
+    materializados das arestas para os vizinhos em ordem de índice, no mesmo
+    formato da lista retornada por ACOMaxClique._init_pheromones.
+
+    A média também não percorre as arestas: entre duas renormalizações os
+    valores armazenados só aumentam, então basta manter a soma dos valores
+    das arestas acima do t_min e contar as que chegaram nele. Um heap com os
+    valores armazenados indica, a cada evaporação, quais arestas passaram a
+    ficar no t_min.
+    """
+
+    def __init__(
+        self,
+        graph: UndirectedGraph,
+        t_min: float,
+        t_max: float,
+        t_init: float = None,
+    ):
+        self._t_min = t_min
+        self._t_max = t_max
+        self._decay = 1.0
+
+        degrees = [
+            graph.n_neighboors(node_idx)
+            for node_idx in range(1, graph.num_nodes + 1)
+        ]
+        self._offsets = np.zeros(len(degrees) + 1, dtype=np.int64)
+        np.cumsum(degrees, out=self._offsets[1:])
+
+        self._values = np.empty(self._offsets[-1])
+        self._values.fill(t_max if t_init is None else t_init)
+        self._rebuild_mean_state()
+
+    def __len__(self) -> int:
+        return self._offsets.shape[0] - 1
+
+    def __getitem__(self, node_idx: int) -> np.ndarray:
+        start = self._offsets[node_idx]
+        end = self._offsets[node_idx + 1]
+        return np.maximum(self._values[start:end] * self._decay, self._t_min)
+
+    def __iter__(self):
+        for node_idx in range(len(self)):
+            yield self[node_idx]
+
+    def pheromone(self, node_idx: int, neigh_idx: int) -> float:
+        """
+        Retorna o feromônio da aresta de node_idx para o vizinho na posição
+        neigh_idx, já com o t_min aplicado.
+        """
+        stored = self._values[self._offsets[node_idx] + neigh_idx]
+        return max(stored * self._decay, self._t_min)
+
+    def add(self, node_idx: int, neigh_idx: int, pheromone_to_add: float):
+        """
+        Deposita pheromone_to_add na aresta de node_idx para o vizinho na
+        posição neigh_idx. O feromônio nunca fica maior que t_max.
+        """
+        self.add_many(
+            [self._offsets[node_idx] + neigh_idx], np.array([pheromone_to_add])
+        )
+
+    def add_many(self, edge_idxs: np.ndarray, amounts: np.ndarray):
+        """
+        Deposita amounts nas arestas de índices edge_idxs na ordem de
+        to_array, somando os depósitos na mesma aresta, em um único passo.
+        O feromônio nunca fica maior que t_max.
+        """
+        edge_idxs, amounts = sum_by_index(edge_idxs, amounts)
+        if edge_idxs.shape[0] == 0:
+            return
+
+        old_values = self._values[edge_idxs]
+        was_clamped = self._clamped[edge_idxs]
+        current = np.maximum(old_values * self._decay, self._t_min)
+        new_values = np.minimum(current + amounts, self._t_max) / self._decay
+        self._values[edge_idxs] = new_values
+
+        self._unclamped_sum += float(
+            new_values.sum() - old_values[~was_clamped].sum()
+        )
+        self._n_clamped -= int(np.count_nonzero(was_clamped))
+        self._clamped[edge_idxs] = False
+        for value, edge_idx in zip(new_values.tolist(), edge_idxs.tolist()):
+            heapq.heappush(
+                self._heap, (value, next(self._heap_seq), edge_idx, None)
+            )
+
+    def evaporate(self, persistence_rate: float):
+        """
+        Evapora todos os feromônios em O(1), acumulando persistence_rate no
+        fator de decaimento global.
+        """
+        self._decay *= persistence_rate
+        if self._decay < _RENORM_THRESHOLD:
+            self.renormalize()
+        else:
+            self._clamp_decayed()
+
+    def renormalize(self):
+        """
+        Materializa os feromônios nos valores armazenados e volta o fator de
+        decaimento global para 1.
+        """
+        np.maximum(self._values * self._decay, self._t_min, out=self._values)
+        self._decay = 1.0
+        self._rebuild_mean_state()
+
+    def mean(self) -> float:
+        """
+        Média dos feromônios materializados, em O(1).
+        """
+        if self._values.shape[0] == 0:
+            return 0.0
+        return (
+            self._unclamped_sum * self._decay + self._n_clamped * self._t_min
+        ) / self._values.shape[0]
+
+    def _clamp_decayed(self):
+        """
+        Marca como presas no t_min as arestas cujo valor armazenado, vezes o
+        fator de decaimento, chegou ao t_min. Entradas do heap de arestas que
+        já estão presas ou receberam depósito depois de entrarem no heap são
+        descartadas.
+        """
+        threshold = self._t_min / self._decay
+        while self._heap and self._heap[0][0] <= threshold:
+            value, _, edge_idx, group_idxs = heapq.heappop(self._heap)
+            if group_idxs is None:
+                group_idxs = np.array([edge_idx])
+            group_idxs = group_idxs[
+                ~self._clamped[group_idxs]
+                & (self._values[group_idxs] == value)
+            ]
+            self._clamped[group_idxs] = True
+            self._n_clamped += group_idxs.shape[0]
+            self._unclamped_sum -= value * group_idxs.shape[0]
+
+    def _rebuild_mean_state(self):
+        """
+        Recalcula do zero, em O(E log E), a soma, as arestas presas e o heap.
+        As arestas com o mesmo valor armazenado ficam em uma só entrada.
+        """
+        self._clamped = self._values * self._decay <= self._t_min
+        self._n_clamped = int(np.count_nonzero(self._clamped))
+        unclamped_idxs = np.flatnonzero(~self._clamped)
+        self._unclamped_sum = float(self._values[unclamped_idxs].sum())
+
+        values, inverse = np.unique(
+            self._values[unclamped_idxs], return_inverse=True
+        )
+        order = np.argsort(inverse, kind="stable")
+        groups = np.split(
+            unclamped_idxs[order], np.cumsum(np.bincount(inverse))[:-1]
+        )
+        # O contador desempata entradas com o mesmo valor, que não podem ser
+        # comparadas pelos índices.
+        self._heap_seq = itertools.count()
+        self._heap = [
+            (value, next(self._heap_seq), None, group_idxs)
+            for value, group_idxs in zip(values.tolist(), groups)
+        ]
+        heapq.heapify(self._heap)
+
+    def to_array(self) -> np.ndarray:
+        """
+        Retorna os feromônios de todas as arestas em um único np.array, na
+        ordem dos nós e, dentro de cada nó, dos vizinhos, sem alterar os
+        valores armazenados.
+        """
+        return np.maximum(self._values * self._decay, self._t_min)
+
+    def load_array(self, values: np.ndarray):
+        self._values[:] = values
+        self._decay = 1.0
+        self._rebuild_mean_state()
+
+
+class VertexPheromones:
+    """
+    Feromônios por vértice (Solnon e Fenet), ocupando O(N) de memória.
+
+    O fator tau de um candidato é apenas o feromônio do próprio vértice, e o
+    depósito reforça somente os k vértices do clique. Indexar com o índice do
+    nó - 1 devolve o feromônio daquele vértice.
+    """
+
+    def __init__(
+        self, num_nodes: int, t_min: float, t_max: float, t_init: float = None
+    ):
+        self._t_min = t_min
+        self._t_max = t_max
+        self._values = np.empty(num_nodes)
+        self._values.fill(t_max if t_init is None else t_init)
+
+    def __len__(self) -> int:
+        return self._values.shape[0]
+
+    def __getitem__(self, node_idx: int) -> float:
+        return self._values[node_idx]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def evaporate(self, persistence_rate: float):
+        """
+        Evapora os feromônios de todos os vértices. O feromônio nunca fica
+        menor que t_min.
+        """
+        np.maximum(
+            self._values * persistence_rate, self._t_min, out=self._values
+        )
+
+    def deposit(self, clique: list, pheromone_to_add: float):
+        """
+        Deposita pheromone_to_add em cada vértice de clique. O feromônio nunca
+        fica maior que t_max.
+        """
+        clique_idxs = np.asarray(clique, dtype=np.int64) - 1
+        self.add_many(
+            clique_idxs, np.full(clique_idxs.shape[0], pheromone_to_add)
+        )
+
+    def add_many(self, node_idxs: np.ndarray, amounts: np.ndarray):
+        """
+        Deposita amounts nos vértices de índices node_idxs, somando os
+        depósitos no mesmo vértice, em um único passo. O feromônio nunca fica
+        maior que t_max.
+        """
+        node_idxs, amounts = sum_by_index(node_idxs, amounts)
+        self._values[node_idxs] = np.minimum(
+            self._values[node_idxs] + amounts, self._t_max
+        )
+
+    def mean(self) -> float:
+        if self._values.shape[0] == 0:
+            return 0.0
+        return float(self._values.mean())
+
+    def to_array(self) -> np.ndarray:
+        return self._values
+
+    def load_array(self, values: np.ndarray):
+        self._values[:] = values
@@ -1,5 +1,12 @@
-import statistics
+import argparse
+import hashlib
+import pathlib
+from multiprocessing import pool
+import numpy as np
 import matplotlib.pyplot as plt
+from results import ResultsAgg
+
+SWEEP_METRICS = ("max_clique", "cycle_max_clique", "mean_p", "similarity")
 
 def plot_fill_between_min_max(values:list, axs:plt.Axes, label:str, c:str=None):
     x = range(len(values))
@@ -25,30 +32,171 @@ def plot_fill_between_mean_std(values:list, axs:plt.Axes, label:str, c:str=None)
         axs.plot(x, y, '-', label=label, color=c)
         axs.fill_between(x, y1, y2, alpha=0.2, color=c)
 
-def plot_matrix_fill_between_mean_min_max(values:list[list], axs:plt.Axes, label:str, c:str=None):
-    x = range(len(values))
-    inner_len = len(values[0])
-    y = [sum(inner_values)/inner_len for inner_values in values]
-    y1 = [min(inner_values) for inner_values in values]
-    y2 = [max(inner_values) for inner_values in values]
-    if c is None:
-        axs.plot(x, y, '-', label=label)
-        axs.fill_between(x, y1, y2, alpha=0.2)
-    else:
-        axs.plot(x, y, '-', label=label, color=c)
-        axs.fill_between(x, y1, y2, alpha=0.2, color=c)
+def plot_matrix_fill_between_mean_min_max(values:list[list], axs:plt.Axes, label:str, c:str=None, max_points:int=None):
+    mean_values, _, min_values, max_values = band_stats(values)
+    plot_band(mean_values, min_values, max_values, axs, label, c, max_points)
+
+def plot_matrix_fill_between_mean_std(values:list[list], axs:plt.Axes, label:str, c:str=None, max_points:int=None):
+    mean_values, stds, _, _ = band_stats(values)
+    plot_band(mean_values, mean_values + stds, mean_values - stds, axs, label, c, max_points)
+
+def band_stats(values) -> tuple:
+    """
+    Recebe uma matriz (its, runs) e retorna, por iteração, a média, o desvio
+    padrão populacional, o mínimo e o máximo entre as runs.
+    """
+    values = np.asarray(values, dtype=float)
+    return (
+        values.mean(axis=1),
+        values.std(axis=1),
+        values.min(axis=1),
+        values.max(axis=1),
+    )
+
+def plot_band(y:np.ndarray, y1:np.ndarray, y2:np.ndarray, axs:plt.Axes, label:str, c:str=None, max_points:int=None):
+    """
+    Plota a linha y e a faixa entre y1 e y2. Com max_points, a linha é
+    reduzida com LTTB e a faixa com min/max por bucket, de forma que os picos
+    continuam visíveis.
+    """
+    x = np.arange(len(y))
+    band_x, band_y1, band_y2 = x, y1, y2
+    if max_points is not None and len(y) > max_points:
+        line_idxs = lttb_indices(x, y, max_points)
+        x, y = x[line_idxs], y[line_idxs]
+        band_x, band_y1, band_y2 = minmax_band(band_x, y1, y2, max_points)
 
-def plot_matrix_fill_between_mean_std(values:list[list], axs:plt.Axes, label:str, c:str=None):
-    x = range(len(values))
-    inner_len = len(values[0])
-    mean_values = [sum(inner_values)/inner_len for inner_values in values]
-    stds = [statistics.pstdev(inner_values) for inner_values in values]
-    y = mean_values
-    y1 = [mean+std for mean, std in zip(mean_values, stds)]
-    y2 = [mean-std for mean, std in zip(mean_values, stds)]
     if c is None:
-        axs.plot(x, y, '-', label=label)
-        axs.fill_between(x, y1, y2, alpha=0.2)
+        line = axs.plot(x, y, '-', label=label)[0]
+        axs.fill_between(band_x, band_y1, band_y2, alpha=0.2, color=line.get_color())
     else:
         axs.plot(x, y, '-', label=label, color=c)
-        axs.fill_between(x, y1, y2, alpha=0.2, color=c)
\ No newline at end of file
+        axs.fill_between(band_x, band_y1, band_y2, alpha=0.2, color=c)
+
+def lttb_indices(x:np.ndarray, y:np.ndarray, n_out:int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: escolhe n_out índices de (x, y), sempre
+    incluindo o primeiro e o último, mantendo a forma da série.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+
+    idxs = np.zeros(n_out, dtype=int)
+    idxs[-1] = n - 1
+    prev = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+
+        areas = np.abs(
+            (x[prev] - next_x) * (y[start:end] - y[prev])
+            - (x[prev] - x[start:end]) * (next_y - y[prev])
+        )
+        prev = start + int(areas.argmax())
+        idxs[bucket + 1] = prev
+
+    return idxs
+
+def minmax_band(x:np.ndarray, y1:np.ndarray, y2:np.ndarray, n_out:int) -> tuple:
+    """
+    Reduz a faixa entre y1 e y2 a n_out buckets, guardando o menor valor
+    inferior e o maior valor superior de cada bucket.
+    """
+    lower = np.minimum(y1, y2)
+    upper = np.maximum(y1, y2)
+    starts = np.linspace(0, len(x), n_out, endpoint=False).astype(int)
+    band_x = np.append(x[starts], x[-1])
+    band_y1 = np.minimum.reduceat(lower, starts)
+    band_y2 = np.maximum.reduceat(upper, starts)
+    return band_x, np.append(band_y1, band_y1[-1]), np.append(band_y2, band_y2[-1])
+
+def find_sweep_folders(results_dir:pathlib.Path) -> list[pathlib.Path]:
+    """
+    Retorna os diretórios em results_dir que têm arquivos run_*.csv.
+    """
+    results_dir = pathlib.Path(results_dir)
+    return sorted({path.parent for path in results_dir.rglob("run_*.csv")})
+
+def sweep_inputs_hash(folder:pathlib.Path, max_points:int) -> str:
+    """
+    Hash dos nomes, tamanhos e datas de modificação dos csvs de folder e de
+    max_points. Se não mudar, a figura não precisa ser refeita.
+    """
+    hasher = hashlib.sha1(str(max_points).encode())
+    for path in sorted(pathlib.Path(folder).glob("run_*.csv")):
+        stat = path.stat()
+        hasher.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return hasher.hexdigest()
+
+def render_sweep_folder(folder:pathlib.Path, fig_path:pathlib.Path, max_points:int=None) -> bool:
+    """
+    Desenha em fig_path a média e o desvio padrão entre as runs de folder para
+    cada métrica de SWEEP_METRICS. Não faz nada se os csvs não mudaram desde a
+    última figura. Retorna se a figura foi desenhada.
+    """
+    fig_path = pathlib.Path(fig_path)
+    stamp_path = fig_path.with_name(fig_path.name + ".stamp")
+    inputs_hash = sweep_inputs_hash(folder, max_points)
+    if fig_path.is_file() and stamp_path.is_file() and stamp_path.read_text() == inputs_hash:
+        return False
+
+    results_agg = ResultsAgg()
+    results_agg.agg_files(sorted(pathlib.Path(folder).glob("run_*.csv")))
+
+    fig, axs = plt.subplots(2, 2, figsize=(12, 8))
+    for metric, ax in zip(SWEEP_METRICS, axs.flat):
+        values = results_agg.metric_matrix(metric)
+        if values.shape[0] > 0:
+            plot_matrix_fill_between_mean_std(values, ax, metric, max_points=max_points)
+        ax.set_title(metric)
+        ax.set_xlabel("it")
+    fig.suptitle(str(folder))
+    fig.tight_layout()
+
+    fig_path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(fig_path)
+    plt.close(fig)
+    stamp_path.write_text(inputs_hash)
+    return True
+
+def _init_render_worker():
+    plt.switch_backend("Agg")
+
+def _render_job(job:tuple) -> tuple:
+    folder, fig_path, max_points = job
+    return folder, render_sweep_folder(folder, fig_path, max_points)
+
+def render_sweep_folders(results_dir:pathlib.Path, out_dir:pathlib.Path, n_p:int=1, max_points:int=None) -> list[tuple]:
+    """
+    Desenha uma figura por sweep folder de results_dir em out_dir, mantendo a
+    mesma estrutura de diretórios, em n_p processos com o backend Agg.
+    Retorna (folder, desenhada) para cada folder.
+    """
+    results_dir = pathlib.Path(results_dir)
+    jobs = [
+        (folder, pathlib.Path(out_dir) / f"{folder.relative_to(results_dir)}.png", max_points)
+        for folder in find_sweep_folders(results_dir)
+    ]
+    if len(jobs) == 0:
+        return []
+
+    with pool.Pool(initializer=_init_render_worker, processes=max(min(n_p, len(jobs)), 1)) as render_pool:
+        return list(render_pool.imap_unordered(_render_job, jobs))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MaxCliqueACO sweep plots")
+    parser.add_argument("--results_dir", required=True, type=str, help="Dir with the sweep folders of run_*.csv files")
+    parser.add_argument("--out_dir", required=True, type=str, help="Dir where to save the figures")
+    parser.add_argument("--n_p", required=False, default=1, type=int, help="Max number of processes to use (int, default: 1)")
+    parser.add_argument("--max_points", required=False, default=500, type=int, help="Max points per plotted series (int, default: 500)")
+    args = parser.parse_args()
+
+    for folder, rendered in render_sweep_folders(args.results_dir, args.out_dir, args.n_p, args.max_points):
+        print("rendered" if rendered else "skipped ", folder, flush=True)
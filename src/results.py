@@ -1,6 +1,7 @@
 import pathlib
 from typing import Dict
 import numpy as np
+from pheromones import LazyPheromones, VertexPheromones
 
 
 class Results:
@@ -46,6 +47,10 @@ class Results:
         return curr_similarity
 
     def calc_mean_pheromones_at_it(self, pheromones: list[np.ndarray], it: int):
+        if isinstance(pheromones, (LazyPheromones, VertexPheromones)):
+            self._mean_pheromones[it] = pheromones.mean()
+            return
+
         total = 0
         total_edges = 0
         for node_edges_phers in pheromones:
@@ -54,42 +59,51 @@ class Results:
 
         self._mean_pheromones[it] = total / total_edges
 
+    def mean_pheromones_at_it(self, it: int) -> float:
+        return self._mean_pheromones[it]
+
     def to_csv(self, path: pathlib.Path, delimiter=","):
+        pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as m_file:
+            for line in self.to_csv_lines(delimiter):
+                m_file.write(line)
+                m_file.write("\n")
+
+    def to_csv_lines(self, delimiter=",") -> list[str]:
+        """
+        Retorna as linhas (sem quebra de linha) do csv escrito por to_csv.
+        """
         # So it has a similarity measure at the last it
         curr_similarity = self._calc_curr_it_sim_ratio()
         self._similarity_ratios[self._curr_it] = curr_similarity
-        
-        pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w") as m_file:
-            header = delimiter.join(
-                "it max_clique max_cycle_clique mean_p similarity re_samp_ratio".split()
-            )
-            m_file.write(header)
-            m_file.write("\n")
 
-            re_samp_ratio = self._re_sampling_ratio()
+        header = delimiter.join(
+            "it max_clique max_cycle_clique mean_p similarity re_samp_ratio".split()
+        )
+        lines = [header]
 
-            curr_max_clique_size = 0
-            for it in range(1, self._curr_it + 1):
-                it_results = list()
+        re_samp_ratio = self._re_sampling_ratio()
 
-                it_results.append(it)
+        curr_max_clique_size = 0
+        for it in range(1, self._curr_it + 1):
+            it_results = list()
 
-                cycle_max_clique = max(self._clique_sizes_per_it[it])
-                if cycle_max_clique > curr_max_clique_size:
-                    curr_max_clique_size = cycle_max_clique
+            it_results.append(it)
 
-                it_results.append(curr_max_clique_size)
-                it_results.append(cycle_max_clique)
+            cycle_max_clique = max(self._clique_sizes_per_it[it])
+            if cycle_max_clique > curr_max_clique_size:
+                curr_max_clique_size = cycle_max_clique
 
-                it_results.append(self._mean_pheromones[it])
-                it_results.append(self._similarity_ratios[it])
-                it_results.append(re_samp_ratio)
+            it_results.append(curr_max_clique_size)
+            it_results.append(cycle_max_clique)
 
-                line = delimiter.join([str(el) for el in it_results])
+            it_results.append(self._mean_pheromones[it])
+            it_results.append(self._similarity_ratios[it])
+            it_results.append(re_samp_ratio)
 
-                m_file.write(line)
-                m_file.write("\n")
+            lines.append(delimiter.join([str(el) for el in it_results]))
+
+        return lines
 
     def _re_sampling_ratio(self) -> float:
         n_diff_cliques_found = len(self._all_cliques_found)
@@ -128,4 +142,26 @@ class ResultsAgg:
                     self.per_cycle_max_clique.setdefault(curr_it, list()).append(int(data[2]))
                     self.per_it_mean_p.setdefault(curr_it, list()).append(float(data[3]))
                     self.per_it_similarity.setdefault(curr_it, list()).append(float(data[4]))
-                    self.per_run_re_samp_ratio[path_id] = float(data[5]) 
\ No newline at end of file
+                    self.per_run_re_samp_ratio[path_id] = float(data[5])
+
+    def metric_matrix(self, metric: str) -> np.ndarray:
+        """
+        Retorna um np.array (its, runs) com os valores agregados de metric,
+        que deve ser uma de 'max_clique', 'cycle_max_clique', 'mean_p' ou
+        'similarity'. Se as runs tiverem tamanhos diferentes, usa apenas as
+        iterações presentes em todas.
+        """
+        per_it = {
+            "max_clique": self.per_it_max_clique,
+            "cycle_max_clique": self.per_cycle_max_clique,
+            "mean_p": self.per_it_mean_p,
+            "similarity": self.per_it_similarity,
+        }[metric]
+
+        n_runs = len(self.per_run_re_samp_ratio)
+        rows = [
+            per_it[it] for it in sorted(per_it) if len(per_it[it]) == n_runs
+        ]
+        if len(rows) == 0:
+            return np.zeros((0, n_runs))
+        return np.array(rows, dtype=float)
@@ -0,0 +1,219 @@
+import pathlib
+import time
+import multiprocessing
+from multiprocessing import current_process
+from graph import UndirectedGraph
+from aco import TauRange, ACOMaxClique
+from checkpoint import atomic_write, remove_checkpoint, save_snapshot_array
+from graph_io import read_graph
+from telemetry import QUEUE_MAX_SIZE, TelemetryAggregator, TelemetryReporter
+
+
+def run(run_id: int) -> dict:
+    """
+    Executa uma run no processo worker, com os argumentos passados ao pool
+    por init, e retorna os resultados para o processo pai escrever.
+    """
+    args = worker_args
+    run_dir = pathlib.Path(args.t_dir) / worker_timestr
+    checkpoint_dir = run_dir / "checkpoints" / f"run_{run_id}"
+
+    start_time = time.monotonic()
+    graph = read_graph(pathlib.Path(args.data_path))
+    return run_aco(
+        args,
+        graph,
+        run_id,
+        checkpoint_dir,
+        start_time,
+        telemetry_reporter(str(run_id)),
+    )
+
+
+def run_aco(
+    args,
+    graph: UndirectedGraph,
+    run_id: int,
+    checkpoint_dir: pathlib.Path,
+    start_time: float,
+    on_iteration=None,
+) -> dict:
+    """
+    Executa o ACOMaxClique em graph com os parâmetros de args e retorna os
+    resultados da run. start_time é o time.monotonic() do início da run e
+    on_iteration é repassado a find_maximum_clique.
+    """
+    t_range = TauRange(args.t_min, args.t_max)
+    aco = ACOMaxClique(
+        graph,
+        args.n_ants,
+        args.n_its,
+        args.evap_r,
+        t_range,
+        args.alpha,
+        args.lazy_evap,
+        args.pheromone_model,
+        checkpoint_dir,
+        args.checkpoint_every,
+        args.deposit_k,
+        args.elite_weight,
+    )
+    pheromones = None
+    if args.snapshot_dir is not None:
+        pheromones = aco.load_snapshot(args.snapshot_dir)
+
+    known_cliques = None
+    if args.known_cliques is not None:
+        known_cliques = read_cliques_file(args.known_cliques)
+
+    maximum_clique = aco.find_maximum_clique(
+        resume=args.resume,
+        pheromones=pheromones,
+        known_cliques=known_cliques,
+        on_iteration=on_iteration,
+    )
+
+    snapshot = None
+    if args.snapshot_dir is not None:
+        snapshot = aco.snapshot(args.snapshot_dir)
+
+    return {
+        "run_id": run_id,
+        "process": current_process().name,
+        "maximum_clique": maximum_clique,
+        "csv_lines": aco.results_csv_lines(),
+        "it_to_best": aco.it_to_best,
+        "time_to_best": aco.time_to_best,
+        "time": time.monotonic() - start_time,
+        "snapshot": snapshot,
+    }
+
+
+def keep_best_snapshot(best_snapshots: dict, run_result: dict):
+    """
+    Guarda em best_snapshots, por caminho de snapshot, os feromônios da run
+    com o maior clique, e os remove de run_result. Os workers não escrevem
+    snapshots: o processo pai salva um por grafo com save_snapshots.
+    """
+    snapshot = run_result.pop("snapshot", None)
+    if snapshot is None:
+        return
+
+    path, pheromones_array = snapshot
+    size = len(run_result["maximum_clique"])
+    if path not in best_snapshots or size > best_snapshots[path][0]:
+        best_snapshots[path] = (size, pheromones_array)
+
+
+def save_snapshots(best_snapshots: dict):
+    for path, (_, pheromones_array) in best_snapshots.items():
+        save_snapshot_array(path, pheromones_array)
+
+
+def write_run_results(run_dir: pathlib.Path, run_result: dict):
+    """
+    Escreve atomicamente o csv de uma run no processo pai e só então remove
+    o seu checkpoint, para que uma run interrompida nunca fique sem nenhum
+    dos dois e --resume nunca veja um csv pela metade.
+    """
+    run_id = run_result["run_id"]
+    run_dir.mkdir(parents=True, exist_ok=True)
+    csv_content = "".join(
+        line + "\n" for line in run_result["csv_lines"]
+    ).encode()
+    atomic_write(
+        run_dir / f"run_{run_id}.csv", lambda m_file: m_file.write(csv_content)
+    )
+
+    checkpoint_dir = run_dir / "checkpoints" / f"run_{run_id}"
+    remove_checkpoint(checkpoint_dir)
+    try:
+        checkpoint_dir.parent.rmdir()
+    except OSError:
+        pass
+
+
+def format_seconds(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def read_cliques_file(path: pathlib.Path) -> list:
+    """
+    Lê um clique por linha, com os nós separados por espaços.
+    Linhas vazias ou iniciadas com 'c' são ignoradas.
+    """
+    cliques = list()
+    with open(path, "r") as cliques_file:
+        for line in cliques_file:
+            line = line.strip()
+            if not line or line.startswith("c"):
+                continue
+            cliques.append([int(node) for node in line.split()])
+
+    return cliques
+
+
+def telemetry_enabled(args) -> bool:
+    return (
+        args.telemetry_log is not None
+        or args.telemetry_port is not None
+        or args.telemetry_socket is not None
+    )
+
+
+def start_telemetry(args) -> tuple:
+    """
+    Cria a fila de telemetria e inicia o TelemetryAggregator no processo pai,
+    se alguma opção --telemetry_* foi passada. Retorna (fila, agregador) ou
+    (None, None).
+    """
+    if not telemetry_enabled(args):
+        return None, None
+
+    telemetry_queue = multiprocessing.Queue(QUEUE_MAX_SIZE)
+    aggregator = TelemetryAggregator(
+        telemetry_queue,
+        args.telemetry_log,
+        args.telemetry_port,
+        args.telemetry_socket,
+    )
+    aggregator.start()
+    return telemetry_queue, aggregator
+
+
+def telemetry_reporter(run_key: str):
+    """
+    Retorna o callback on_iteration que envia as métricas da run run_key
+    para a fila passada a init, ou None se a telemetria está desligada.
+    """
+    if worker_telemetry is None:
+        return None
+    return TelemetryReporter(
+        worker_telemetry, run_key, worker_args.n_ants, worker_args.telemetry_every
+    )
+
+
+def init(args, timestr, telemetry_queue=None):
+    global worker_args, worker_timestr, worker_telemetry
+    worker_args = args
+    worker_timestr = timestr
+    worker_telemetry = telemetry_queue
+
+
+def print_progress(
+    run_result: dict, runs_done: int, total_runs: int, start_time: float
+):
+    elapsed = time.monotonic() - start_time
+    eta = elapsed / runs_done * (total_runs - runs_done)
+    maximum_clique = run_result["maximum_clique"]
+    print(
+        f"[{runs_done}/{total_runs}] (R: {run_result['run_id']},",
+        f"{run_result['process']}, {run_result['time']:.1f}s)",
+        f"elapsed: {format_seconds(elapsed)}",
+        f"ETA: {format_seconds(eta)}",
+        "\n Maximum Clique:", maximum_clique,
+        " Total nodes: ", len(maximum_clique),
+        flush=True,
+    )
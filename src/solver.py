@@ -0,0 +1,259 @@
+from __future__ import annotations
+import argparse
+import json
+import pathlib
+import random
+import socketserver
+import sys
+import time
+from collections import OrderedDict
+from graph import UndirectedGraph
+from aco import TauRange, ACOMaxClique, validate_params
+from graph_io import read_graph
+
+
+class LRUCache:
+    """
+    Dicionário de tamanho máximo max_size que descarta o item usado há mais
+    tempo quando fica cheio.
+    """
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._items = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key) -> bool:
+        return key in self._items
+
+    def get(self, key, default=None):
+        if key not in self._items:
+            return default
+        self._items.move_to_end(key)
+        return self._items[key]
+
+    def put(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self._max_size:
+            self._items.popitem(last=False)
+
+
+class MaxCliqueSolver:
+    """
+    API para resolver várias instâncias no mesmo processo.
+
+    Os grafos lidos e os feromônios ao fim de cada execução ficam em caches
+    LRU, então chamadas seguintes para o mesmo arquivo não relêem o grafo e,
+    com warm=True, continuam dos feromônios da execução anterior.
+    """
+
+    def __init__(self, max_graphs: int = 4, max_pheromones: int = 4):
+        self._graphs = LRUCache(max_graphs)
+        self._pheromones = LRUCache(max_pheromones)
+
+    def load_graph(self, data_path: pathlib.Path) -> UndirectedGraph:
+        """
+        Retorna o grafo de data_path, lendo o arquivo apenas se ele não
+        estiver no cache ou tiver sido modificado.
+        """
+        key = self._graph_key(data_path)
+        graph = self._graphs.get(key)
+        if graph is None:
+            graph = read_graph(pathlib.Path(data_path))
+            self._graphs.put(key, graph)
+        return graph
+
+    def solve(
+        self,
+        data_path: pathlib.Path,
+        n_ants: int = 10,
+        n_its: int = 100,
+        evap_r: float = 0.05,
+        t_min: float = 0.1,
+        t_max: float = 0.9,
+        alpha: int = 1,
+        lazy_evap: bool = False,
+        pheromone_model: str = "edge",
+        deposit_k: int = 1,
+        elite_weight: float = 0.0,
+        seed: int = None,
+        deadline: float = None,
+        warm: bool = False,
+        known_cliques: list = None,
+    ) -> dict:
+        """
+        Executa o ACOMaxClique no grafo de data_path e retorna um dicionário
+        com o clique encontrado e estatísticas da execução.
+        deadline é o tempo máximo, em segundos, da execução.
+        Com warm=True, começa dos feromônios da última execução com o mesmo
+        grafo, modelo de feromônio e t_range, se estiverem no cache.
+        known_cliques são repassados para ACOMaxClique.find_maximum_clique.
+        """
+        validate_params(
+            t_min, t_max, evap_r, n_ants, n_its, alpha, deposit_k, elite_weight
+        )
+
+        start_time = time.monotonic()
+        graph_cached = self._graph_key(data_path) in self._graphs
+        graph = self.load_graph(data_path)
+        load_time = time.monotonic() - start_time
+
+        if seed is not None:
+            random.seed(seed)
+
+        aco = ACOMaxClique(
+            graph,
+            n_ants,
+            n_its,
+            evap_r,
+            TauRange(t_min, t_max),
+            alpha,
+            lazy_evap,
+            pheromone_model,
+            deposit_k=deposit_k,
+            elite_weight=elite_weight,
+        )
+
+        pheromones_key = (
+            self._graph_key(data_path),
+            pheromone_model,
+            lazy_evap,
+            t_min,
+            t_max,
+        )
+        pheromones = None
+        if warm:
+            pheromones = self._pheromones.get(pheromones_key)
+
+        time_limit = None
+        if deadline is not None:
+            time_limit = max(deadline - load_time, 0)
+
+        maximum_clique = aco.find_maximum_clique(
+            pheromones=pheromones,
+            time_limit=time_limit,
+            known_cliques=known_cliques,
+        )
+        self._pheromones.put(pheromones_key, aco.pheromones)
+
+        return {
+            "clique": [int(node) for node in maximum_clique],
+            "size": len(maximum_clique),
+            "its": aco.its_run,
+            "time": time.monotonic() - start_time,
+            "graph_cached": graph_cached,
+            "warm": pheromones is not None,
+        }
+
+    def handle_request(self, request: dict) -> dict:
+        """
+        Resolve um pedido no formato {"id": ..., "data_path": ..., <parâmetros
+        de solve>} e retorna {"id": ..., "ok": ..., "result" ou "error": ...}.
+        """
+        request_id = None
+        try:
+            if not isinstance(request, dict):
+                raise TypeError("O pedido deve ser um objeto JSON!")
+
+            request = dict(request)
+            request_id = request.pop("id", None)
+            result = self.solve(**request)
+        except Exception as error:
+            return {"id": request_id, "ok": False, "error": str(error)}
+
+        return {"id": request_id, "ok": True, "result": result}
+
+    def serve_jsonl(self, in_stream=sys.stdin, out_stream=sys.stdout):
+        """
+        Lê um pedido JSON por linha de in_stream e escreve cada resposta como
+        uma linha JSON em out_stream.
+        """
+        for line in in_stream:
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as error:
+                response = {"id": None, "ok": False, "error": str(error)}
+            else:
+                response = self.handle_request(request)
+
+            out_stream.write(json.dumps(response))
+            out_stream.write("\n")
+            out_stream.flush()
+
+    def serve_unix_socket(self, socket_path: pathlib.Path):
+        """
+        Atende pedidos JSON-lines em um Unix socket, um cliente por vez, para
+        que todos compartilhem os mesmos caches.
+        """
+        solver = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                lines = (line.decode() for line in self.rfile)
+                out_stream = _SocketWriter(self.wfile)
+                solver.serve_jsonl(lines, out_stream)
+
+        socket_path = pathlib.Path(socket_path)
+        if socket_path.exists():
+            socket_path.unlink()
+
+        with socketserver.UnixStreamServer(str(socket_path), Handler) as server:
+            try:
+                server.serve_forever()
+            finally:
+                socket_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _graph_key(data_path: pathlib.Path) -> tuple:
+        data_path = pathlib.Path(data_path).resolve()
+        return (str(data_path), data_path.stat().st_mtime_ns)
+
+
+class _SocketWriter:
+    def __init__(self, wfile):
+        self._wfile = wfile
+
+    def write(self, text: str):
+        self._wfile.write(text.encode())
+
+    def flush(self):
+        self._wfile.flush()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MaxCliqueACO solver service")
+    parser.add_argument(
+        "--socket",
+        required=False,
+        default=None,
+        type=str,
+        help="Serve on this Unix socket instead of stdin/stdout",
+    )
+    parser.add_argument(
+        "--max_graphs",
+        required=False,
+        default=4,
+        type=int,
+        help="Max number of graphs kept in memory (int, default: 4)",
+    )
+    parser.add_argument(
+        "--max_pheromones",
+        required=False,
+        default=4,
+        type=int,
+        help="Max number of pheromone states kept in memory (int, default: 4)",
+    )
+    args = parser.parse_args()
+
+    solver = MaxCliqueSolver(args.max_graphs, args.max_pheromones)
+    if args.socket is None:
+        solver.serve_jsonl()
+    else:
+        solver.serve_unix_socket(args.socket)
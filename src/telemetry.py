@@ -0,0 +1,197 @@
+import asyncio
+import json
+import pathlib
+import queue
+import threading
+import time
+
+# Quantas mensagens podem ficar na fila antes de os workers começarem a
+# descartar as novas, para que a telemetria nunca bloqueie uma run.
+QUEUE_MAX_SIZE = 10000
+
+# De quanto em quanto tempo TelemetryAggregator.stop verifica se a thread
+# ainda está viva enquanto a fila está cheia.
+_STOP_POLL_SECONDS = 0.1
+
+
+class TelemetryReporter:
+    """
+    Callback on_iteration de ACOMaxClique.find_maximum_clique que envia as
+    métricas da iteração para a fila do TelemetryAggregator no processo pai.
+    Envia uma mensagem a cada every iterações e a descarta se a fila estiver
+    cheia.
+    """
+
+    def __init__(
+        self, telemetry_queue, run_key: str, n_ants: int, every: int = 1
+    ):
+        self._queue = telemetry_queue
+        self._run_key = run_key
+        self._n_ants = n_ants
+        self._every = every
+
+    def __call__(
+        self,
+        it: int,
+        final_max_clique: list,
+        cycle_max_clique: list,
+        mean_pheromone: float,
+        it_time: float,
+    ):
+        if it % self._every != 0:
+            return
+
+        ants_per_sec = self._n_ants / it_time if it_time > 0 else None
+        try:
+            self._queue.put_nowait(
+                {
+                    "run": self._run_key,
+                    "it": it,
+                    "best": len(final_max_clique),
+                    "cycle_best": len(cycle_max_clique),
+                    "mean_p": float(mean_pheromone),
+                    "ants_per_sec": ants_per_sec,
+                    "time": time.time(),
+                }
+            )
+        except queue.Full:
+            pass
+
+
+class TelemetryAggregator:
+    """
+    Lê as métricas enviadas pelos TelemetryReporter em um loop asyncio em uma
+    thread do processo pai. Cada mensagem é escrita como uma linha JSON em
+    log_path, e a última mensagem de cada run pode ser consultada em
+    127.0.0.1:http_port (HTTP GET) ou em socket_path (Unix socket), junto com
+    os segundos desde a última atualização para achar runs travadas.
+    """
+
+    def __init__(
+        self,
+        telemetry_queue,
+        log_path: pathlib.Path = None,
+        http_port: int = None,
+        socket_path: pathlib.Path = None,
+    ):
+        self._queue = telemetry_queue
+        self._log_path = log_path
+        self._http_port = http_port
+        self._socket_path = socket_path
+        self._latest = dict()
+        self._thread = None
+        self._ready = threading.Event()
+        self._start_error = None
+
+    def start(self):
+        """
+        Inicia o loop e espera o log e os servidores abrirem. Se algum não
+        puder ser aberto (por exemplo, a porta já está em uso), relança o
+        erro.
+        """
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._start_error is not None:
+            self._thread.join()
+            raise self._start_error
+
+    def stop(self):
+        """
+        Espera as mensagens já enviadas serem processadas e encerra o loop.
+        Não bloqueia se a thread já tiver morrido com a fila cheia.
+        """
+        while self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=_STOP_POLL_SECONDS)
+                break
+            except queue.Full:
+                # A thread pode ter morrido com a fila cheia e ninguém mais
+                # vai esvaziá-la.
+                continue
+        self._thread.join()
+
+    def snapshot(self) -> dict:
+        now = time.time()
+        return {
+            run_key: dict(metrics, seconds_since_update=now - metrics["time"])
+            for run_key, metrics in self._latest.items()
+        }
+
+    def _run(self):
+        asyncio.run(self._main())
+
+    async def _main(self):
+        servers = list()
+        log_file = None
+        try:
+            if self._log_path is not None:
+                log_path = pathlib.Path(self._log_path)
+                log_path.parent.mkdir(parents=True, exist_ok=True)
+                log_file = open(log_path, "a")
+            if self._http_port is not None:
+                servers.append(
+                    await asyncio.start_server(
+                        self._handle_http, "127.0.0.1", self._http_port
+                    )
+                )
+            if self._socket_path is not None:
+                pathlib.Path(self._socket_path).unlink(missing_ok=True)
+                servers.append(
+                    await asyncio.start_unix_server(
+                        self._handle_socket, str(self._socket_path)
+                    )
+                )
+        except Exception as error:
+            self._start_error = error
+            if log_file is not None:
+                log_file.close()
+            for server in servers:
+                server.close()
+                await server.wait_closed()
+            return
+        finally:
+            self._ready.set()
+
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                message = await loop.run_in_executor(None, self._queue.get)
+                if message is None:
+                    break
+
+                self._latest[message["run"]] = message
+                if log_file is not None:
+                    log_file.write(json.dumps(message))
+                    log_file.write("\n")
+                    log_file.flush()
+        finally:
+            if log_file is not None:
+                log_file.close()
+            for server in servers:
+                server.close()
+                await server.wait_closed()
+            if self._socket_path is not None:
+                pathlib.Path(self._socket_path).unlink(missing_ok=True)
+
+    async def _handle_http(self, reader, writer):
+        await reader.readline()
+        while (await reader.readline()).strip():
+            pass
+
+        body = json.dumps(self.snapshot()).encode()
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: application/json\r\n"
+            + f"Content-Length: {len(body)}\r\n".encode()
+            + b"Connection: close\r\n\r\n"
+            + body
+        )
+        await writer.drain()
+        writer.close()
+
+    async def _handle_socket(self, reader, writer):
+        writer.write(json.dumps(self.snapshot()).encode())
+        writer.write(b"\n")
+        await writer.drain()
+        writer.close()
@@ -1,6 +1,6 @@
 from unittest import main, TestCase
 from graph import UndirectedGraph
-from aco import ACOMaxClique, TauRange
+from aco import ACOMaxClique, TauRange, validate_params
 import pathlib
 import numpy as np
 
@@ -175,9 +175,125 @@ class TestACOMaxClique(TestCase):
         clique_found = self.aco._find_ant_clique(pheromones_list, initial_node)
         self.assertTrue(len(clique_found) > 0)
     
+    def test_known_cliques_deposit_pheromones(self):
+        known_clique = [2, 3, 5, 9]
+        for lazy_evap, pheromone_model in (
+            (False, "edge"), (True, "edge"), (False, "vertex")
+        ):
+            aco = ACOMaxClique(
+                self.graph, 10, 1, self.evap_r, TauRange(0.1, self.t_max),
+                self.alpha, lazy_evap, pheromone_model,
+            )
+            aco.find_maximum_clique(known_cliques=[known_clique])
+            with self.subTest(pheromone_model=pheromone_model, lazy=lazy_evap):
+                self.assert_clique_stands_out(aco, known_clique)
+
+    def assert_clique_stands_out(self, aco: ACOMaxClique, clique: list):
+        """
+        Verifica que todo feromônio de clique é maior que todos os outros.
+        """
+        clique_pheromones = list()
+        other_pheromones = list()
+        for node in range(1, self.graph.num_nodes + 1):
+            if aco._pheromone_model == "vertex":
+                target = clique_pheromones if node in clique else other_pheromones
+                target.append(aco._pheromones[node - 1])
+                continue
+
+            neighboors = self.graph.ordered_neighboors(node)
+            for neigh, pheromone in zip(neighboors, aco._pheromones[node - 1]):
+                in_clique = node in clique and neigh in clique
+                target = clique_pheromones if in_clique else other_pheromones
+                target.append(pheromone)
+
+        self.assertGreater(min(clique_pheromones), max(other_pheromones))
+
+    def test_known_cliques_must_be_cliques(self):
+        with self.assertRaises(ValueError):
+            self.aco.find_maximum_clique(known_cliques=[[1, 3]])
+
+    def test_known_cliques_start_final_max_clique(self):
+        maximum_clique_found = self.aco.find_maximum_clique(
+            known_cliques=[[2, 3, 5, 9]]
+        )
+        self.assertTrue(len(maximum_clique_found) == 4)
+
     def test_can_find_maximum_clique_simple_problem(self):
         maximum_clique_found = self.aco.find_maximum_clique()
         self.assertTrue(len(maximum_clique_found) == 4)
 
+    def test_ranked_deposit_matches_sequential_deposits(self):
+        ranked_aco = ACOMaxClique(
+            self.graph, 10, 10, self.evap_r, TauRange(0.01, 5), self.alpha,
+            deposit_k=2, elite_weight=0.5,
+        )
+        ranked = [array * 0 + 0.01 for array in ranked_aco._init_pheromones()]
+        sequential = [array.copy() for array in ranked]
+        final_max_clique = [2, 3, 5, 9]
+        ant_cliques = [[4, 6], [4, 6, 7], [2, 3, 5, 9]]
+
+        ranked_aco._deposit_ranked_pheromones(
+            ranked, ant_cliques, final_max_clique
+        )
+        # Posição 0: [2, 3, 5, 9] com 2/2 * 1/1, posição 1: [4, 6, 7] com
+        # 1/2 * 1/2 e o elitista [2, 3, 5, 9] com 0.5
+        for clique, amount in (
+            ([2, 3, 5, 9], 1), ([4, 6, 7], 0.25), ([2, 3, 5, 9], 0.5)
+        ):
+            ranked_aco._deposit_cliques(sequential, [clique], [amount])
+
+        for ranked_array, sequential_array in zip(ranked, sequential):
+            self.assertTrue(np.allclose(ranked_array, sequential_array))
+        self.assertAlmostEqual(ranked[1][1], 1.51)
+        self.assertAlmostEqual(ranked[3][1], 0.26)
+
+    def test_ranked_deposit_clamps_at_t_max(self):
+        aco = ACOMaxClique(
+            self.graph, 10, 10, self.evap_r, TauRange(0.1, self.t_max),
+            self.alpha, deposit_k=3, elite_weight=1,
+        )
+        pheromones = aco._init_pheromones()
+        aco._deposit_ranked_pheromones(
+            pheromones, [[2, 3, 5, 9]] * 3, [2, 3, 5, 9]
+        )
+        for array in pheromones:
+            self.assertTrue((array <= self.t_max).all())
+
+    def test_invalid_deposit_params(self):
+        t_range = TauRange(0.1, self.t_max)
+        with self.assertRaises(ValueError):
+            ACOMaxClique(self.graph, 10, 10, 0.05, t_range, 1, deposit_k=0)
+        with self.assertRaises(ValueError):
+            ACOMaxClique(self.graph, 10, 10, 0.05, t_range, 1, elite_weight=-1)
+
+    def test_validate_params(self):
+        validate_params(0.1, 0.9, 0.05, 10, 10, 1, deposit_k=3, elite_weight=1)
+        for params in (
+            dict(t_min=0.9, t_max=0.1),
+            dict(evap_r=1.5),
+            dict(n_ants=0),
+            dict(n_its=0),
+            dict(alpha=0),
+            dict(deposit_k=0),
+            dict(elite_weight=-1),
+        ):
+            valid = dict(
+                t_min=0.1, t_max=0.9, evap_r=0.05, n_ants=10, n_its=10, alpha=1
+            )
+            with self.subTest(**params):
+                with self.assertRaises(ValueError):
+                    validate_params(**{**valid, **params})
+
+    def test_ranked_deposit_finds_maximum_clique(self):
+        for lazy_evap, pheromone_model in (
+            (False, "edge"), (True, "edge"), (False, "vertex")
+        ):
+            aco = ACOMaxClique(
+                self.graph, 10, 10, self.evap_r, TauRange(0.1, self.t_max),
+                self.alpha, lazy_evap, pheromone_model,
+                deposit_k=3, elite_weight=0.5,
+            )
+            self.assertEqual(len(aco.find_maximum_clique()), 4)
+
 if __name__ == "__main__":
     main()
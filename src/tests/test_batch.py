@@ -0,0 +1,61 @@
+from unittest import main, TestCase
+from batch import Instance, list_instances, schedule_jobs, summarize
+import pathlib
+import tempfile
+
+data_dir_path = pathlib.Path(__file__).parent / "data"
+
+
+class TestBatch(TestCase):
+    def test_instance_header(self):
+        instance = Instance(data_dir_path / "graph_10n_10e.col")
+        self.assertEqual(instance.num_nodes, 10)
+        self.assertEqual(instance.num_edges, 15)
+        self.assertAlmostEqual(instance.density, 15 / 45)
+
+    def test_list_instances_from_dir(self):
+        instances = list_instances(data_dir_path)
+        self.assertListEqual(
+            [instance.name for instance in instances],
+            ["data_test", "graph_10n_10e", "repeated_edges"],
+        )
+
+    def test_list_instances_from_manifest(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            manifest = pathlib.Path(tmp_dir) / "manifest.txt"
+            manifest.write_text(
+                f"# comentário\n\n{data_dir_path / 'data_test.col'}\n"
+            )
+            instances = list_instances(manifest)
+        self.assertListEqual(
+            [instance.name for instance in instances], ["data_test"]
+        )
+
+    def test_jobs_largest_first(self):
+        instances = list_instances(data_dir_path)
+        jobs = schedule_jobs(instances, 2, 10, 10)
+        self.assertEqual(len(jobs), 6)
+        self.assertTrue(jobs[0][0].endswith("graph_10n_10e.col"))
+        self.assertListEqual([run_id for _, run_id in jobs[:2]], [0, 1])
+
+        costs = [Instance(path).estimate_cost(10, 10) for path, _ in jobs]
+        self.assertListEqual(costs, sorted(costs, reverse=True))
+
+    def test_summarize(self):
+        instance = Instance(data_dir_path / "graph_10n_10e.col")
+        results = {
+            "graph_10n_10e": [
+                {"maximum_clique": [2, 3, 5, 9], "it_to_best": 1,
+                 "time_to_best": 0.5, "time": 1.0},
+                {"maximum_clique": [4, 6, 7], "it_to_best": 3,
+                 "time_to_best": 1.5, "time": 2.0},
+            ]
+        }
+        rows = summarize([instance], results)
+        self.assertListEqual(
+            rows[0][4:], [2, 4, 3.5, 0.5, 2.0, 1.0, 1.5]
+        )
+
+
+if __name__ == "__main__":
+    main()
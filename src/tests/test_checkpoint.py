@@ -0,0 +1,166 @@
+from unittest import main, TestCase
+from graph import UndirectedGraph
+from aco import ACOMaxClique, TauRange
+from checkpoint import load_checkpoint
+from main import config_arg_parser, run_single
+from runner import write_run_results
+from unittest import mock
+import contextlib
+import io
+import pathlib
+import random
+import tempfile
+import numpy as np
+
+data_dir_path = pathlib.Path(__file__).parent / "data"
+
+
+class TestCheckpoint(TestCase):
+    def setUp(self):
+        test_data_path = data_dir_path / "graph_10n_10e.col"
+        self.graph = UndirectedGraph.from_col_file(test_data_path)
+        self.t_range = TauRange(0.1, 0.9)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.ckpt_dir = pathlib.Path(self.tmp_dir.name) / "run_0"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def make_aco(self, pheromone_model="edge", lazy_evap=False):
+        return ACOMaxClique(
+            self.graph, 5, 10, 0.05, self.t_range, 1,
+            lazy_evap=lazy_evap,
+            pheromone_model=pheromone_model,
+            checkpoint_dir=self.ckpt_dir,
+            checkpoint_every=4,
+        )
+
+    def test_checkpoint_saves_last_multiple(self):
+        aco = self.make_aco()
+        aco.find_maximum_clique()
+        state = load_checkpoint(self.ckpt_dir, aco._init_pheromones())
+        self.assertEqual(state.next_it, 8)
+        self.assertEqual(len(list(self.ckpt_dir.glob("*.npy"))), 1)
+        self.assertEqual(len(list(self.ckpt_dir.glob("*.tmp"))), 0)
+
+    def test_no_checkpoint_returns_none(self):
+        aco = self.make_aco()
+        self.assertIsNone(
+            load_checkpoint(self.ckpt_dir, aco._init_pheromones())
+        )
+
+    def test_resume_matches_uninterrupted_run(self):
+        for model, lazy in (("edge", False), ("edge", True), ("vertex", False)):
+            random.seed(7)
+            aco = self.make_aco(model, lazy)
+            expected_clique = aco.find_maximum_clique()
+            expected_means = dict(aco._results_tracker._mean_pheromones)
+
+            resumed_aco = self.make_aco(model, lazy)
+            resumed_clique = resumed_aco.find_maximum_clique(resume=True)
+            resumed_means = resumed_aco._results_tracker._mean_pheromones
+
+            self.assertListEqual(expected_clique, resumed_clique)
+            self.assertEqual(expected_means.keys(), resumed_means.keys())
+            for it, mean in expected_means.items():
+                self.assertTrue(np.isclose(mean, resumed_means[it]))
+
+    def test_wrong_size_raises(self):
+        aco = self.make_aco()
+        aco.find_maximum_clique()
+        vertex_aco = self.make_aco("vertex")
+        with self.assertRaises(ValueError):
+            vertex_aco.find_maximum_clique(resume=True)
+
+
+class TestWriteRunResults(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.run_dir = pathlib.Path(self.tmp_dir.name)
+        self.ckpt_dir = self.run_dir / "checkpoints" / "run_0"
+        self.ckpt_dir.mkdir(parents=True)
+        (self.ckpt_dir / "state.pkl").write_bytes(b"")
+        self.run_result = {"run_id": 0, "csv_lines": ["a,b", "1,2"]}
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_writes_csv_then_removes_checkpoint(self):
+        write_run_results(self.run_dir, self.run_result)
+        self.assertEqual((self.run_dir / "run_0.csv").read_text(), "a,b\n1,2\n")
+        self.assertFalse(self.ckpt_dir.exists())
+        self.assertEqual(len(list(self.run_dir.glob("*.tmp"))), 0)
+
+    def test_failed_write_keeps_checkpoint(self):
+        with mock.patch("runner.atomic_write", side_effect=OSError):
+            with self.assertRaises(OSError):
+                write_run_results(self.run_dir, self.run_result)
+        self.assertFalse((self.run_dir / "run_0.csv").exists())
+        self.assertTrue(self.ckpt_dir.exists())
+
+
+class TestPheromonesSnapshot(TestCase):
+    def setUp(self):
+        test_data_path = data_dir_path / "graph_10n_10e.col"
+        self.graph = UndirectedGraph.from_col_file(test_data_path)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.snapshot_dir = pathlib.Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def make_aco(self, pheromone_model="edge"):
+        return ACOMaxClique(
+            self.graph, 5, 5, 0.05, TauRange(0.1, 0.9), 1,
+            pheromone_model=pheromone_model,
+        )
+
+    def test_no_snapshot_returns_none(self):
+        self.assertIsNone(self.make_aco().load_snapshot(self.snapshot_dir))
+
+    def test_snapshot_round_trip(self):
+        for model in ("edge", "vertex"):
+            aco = self.make_aco(model)
+            aco.find_maximum_clique()
+            path = aco.save_snapshot(self.snapshot_dir)
+            self.assertIn(self.graph.content_hash(), path.name)
+
+            loaded = self.make_aco(model).load_snapshot(self.snapshot_dir)
+            for expected, loaded_pher in zip(aco.pheromones, loaded):
+                self.assertTrue(np.all(expected == loaded_pher))
+
+    def test_snapshot_of_other_graph_not_loaded(self):
+        aco = self.make_aco()
+        aco.find_maximum_clique()
+        aco.save_snapshot(self.snapshot_dir)
+
+        other_graph = UndirectedGraph.from_col_file(
+            data_dir_path / "data_test.col"
+        )
+        other_aco = ACOMaxClique(other_graph, 5, 5, 0.05, TauRange(0.1, 0.9), 1)
+        self.assertIsNone(other_aco.load_snapshot(self.snapshot_dir))
+
+    def test_parallel_runs_save_one_snapshot(self):
+        t_dir = self.snapshot_dir / "results"
+        snapshot_dir = self.snapshot_dir / "snap"
+        args = config_arg_parser().parse_args(
+            [
+                "--data_path", str(data_dir_path / "graph_10n_10e.col"),
+                "--n_its", "5",
+                "--n_r", "3",
+                "--n_p", "2",
+                "--t_dir", str(t_dir),
+                "--snapshot_dir", str(snapshot_dir),
+            ]
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_single(args)
+
+        self.assertEqual(len(list(t_dir.glob("*/run_*.csv"))), 3)
+        self.assertEqual(len(list(snapshot_dir.glob("*.npy"))), 1)
+        self.assertEqual(len(list(snapshot_dir.glob("*.tmp"))), 0)
+        self.assertIsNotNone(self.make_aco().load_snapshot(snapshot_dir))
+
+
+if __name__ == "__main__":
+    main()
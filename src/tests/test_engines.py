@@ -0,0 +1,182 @@
+from unittest import main, TestCase, skipUnless
+from aco import ACOMaxClique, TauRange
+from generator import SyntheticGraph
+from graph import UndirectedGraph
+from graph_io import read_graph
+import os
+import pathlib
+import random
+import statistics
+import time
+
+data_dir_path = pathlib.Path(__file__).parent / "data"
+repo_data_dir_path = pathlib.Path(__file__).parents[2] / "data"
+
+# Parâmetros extras de ACOMaxClique de cada engine. Um engine novo só
+# precisa ser adicionado aqui, em TIME_BUDGETS e, se for uma otimização que
+# não muda o algoritmo, em EXACT_ENGINES.
+ENGINES = {
+    "reference": dict(),
+    "lazy": dict(lazy_evap=True),
+    "vertex": dict(pheromone_model="vertex"),
+    "rank": dict(deposit_k=3, elite_weight=0.5),
+}
+
+# Engines que, com a mesma seed, devem encontrar exatamente os mesmos cliques
+# que o reference.
+EXACT_ENGINES = ("lazy",)
+
+# Tempo máximo de cada engine, como fração do tempo do reference com o mesmo
+# grafo e as mesmas seeds, e as iterações de cada medida, para que a medida
+# do reference leve mais de um segundo. Só é verificado com RUN_TIMING_TESTS
+# definida (make bench).
+TIME_BUDGETS = {
+    # Esparso: a evaporação de todas as arestas pesa em cada iteração.
+    "dsjc125.1.col": dict(
+        n_its=300, budgets={"lazy": 0.7, "vertex": 0.7, "rank": 1.5}
+    ),
+    # Denso: as formigas dominam o tempo, então a evaporação preguiçosa só
+    # não pode deixar o engine mais lento.
+    "p_hat700-2.clq": dict(
+        n_its=10, budgets={"lazy": 1.1, "vertex": 0.5, "rank": 1.5}
+    ),
+}
+
+# Quanto o tamanho médio dos cliques de um engine pode ficar abaixo do
+# tamanho médio dos cliques do reference.
+MEAN_SIZE_TOLERANCE = 1.0
+
+SEEDS = range(4)
+N_ANTS = 10
+N_ITS = 20
+
+# Repetições das medidas de tempo, para que o ruído pese pouco na mediana.
+TIMING_REPEATS = 5
+
+
+def harness_graphs() -> dict:
+    """
+    Grafos do repositório e grafos gerados com um clique plantado.
+    """
+    graphs = {
+        "graph_10n_10e": UndirectedGraph.from_col_file(
+            data_dir_path / "graph_10n_10e.col"
+        ),
+        "dsjc125.1": read_graph(repo_data_dir_path / "dsjc125.1.col"),
+    }
+    for kind in ("gnp", "brock", "phat"):
+        graphs[f"{kind}_60"] = SyntheticGraph(
+            kind, 60, p=0.5, clique_size=10, seed=7
+        ).to_graph()
+    return graphs
+
+
+def run_engine(
+    graph: UndirectedGraph, engine: str, seed: int, n_its: int = N_ITS
+) -> list:
+    random.seed(seed)
+    aco = ACOMaxClique(
+        graph, N_ANTS, n_its, 0.05, TauRange(0.1, 0.9), 1, **ENGINES[engine]
+    )
+    return aco.find_maximum_clique()
+
+
+def engine_time(graph: UndirectedGraph, engine: str, n_its: int) -> float:
+    """
+    Mediana, entre TIMING_REPEATS repetições, do tempo para rodar engine com
+    todas as SEEDS e n_its iterações.
+    """
+    times = list()
+    for _ in range(TIMING_REPEATS):
+        start_time = time.perf_counter()
+        for seed in SEEDS:
+            run_engine(graph, engine, seed, n_its)
+        times.append(time.perf_counter() - start_time)
+    return statistics.median(times)
+
+
+class TestEngines(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.graphs = harness_graphs()
+        cls.cliques = {
+            (graph_name, engine): [
+                run_engine(graph, engine, seed) for seed in SEEDS
+            ]
+            for graph_name, graph in cls.graphs.items()
+            for engine in ENGINES
+        }
+
+    def assert_maximal_clique(self, graph: UndirectedGraph, clique: list):
+        self.assertEqual(len(clique), len(set(clique)))
+        neighboors = {
+            node: set(graph.ordered_neighboors(node)) for node in clique
+        }
+        for node in clique:
+            self.assertLessEqual(set(clique) - {node}, neighboors[node])
+
+        common = set.intersection(*neighboors.values()) - set(clique)
+        self.assertSetEqual(common, set(), f"{clique} não é maximal")
+
+    def test_cliques_are_maximal(self):
+        for (graph_name, engine), cliques in self.cliques.items():
+            with self.subTest(graph=graph_name, engine=engine):
+                for clique in cliques:
+                    self.assert_maximal_clique(self.graphs[graph_name], clique)
+
+    def test_exact_engines_match_reference(self):
+        for graph_name in self.graphs:
+            reference = self.cliques[graph_name, "reference"]
+            for engine in EXACT_ENGINES:
+                with self.subTest(graph=graph_name, engine=engine):
+                    self.assertListEqual(
+                        self.cliques[graph_name, engine], reference
+                    )
+
+    def test_result_distributions_match_reference(self):
+        for graph_name in self.graphs:
+            reference_sizes = [
+                len(clique) for clique in self.cliques[graph_name, "reference"]
+            ]
+            for engine in ENGINES:
+                sizes = [
+                    len(clique) for clique in self.cliques[graph_name, engine]
+                ]
+                with self.subTest(graph=graph_name, engine=engine):
+                    self.assertGreaterEqual(
+                        statistics.mean(sizes),
+                        statistics.mean(reference_sizes) - MEAN_SIZE_TOLERANCE,
+                    )
+                    self.assertGreaterEqual(max(sizes), min(reference_sizes))
+
+    def test_every_engine_has_a_time_budget(self):
+        for graph_file, timing in TIME_BUDGETS.items():
+            with self.subTest(graph=graph_file):
+                self.assertSetEqual(
+                    set(timing["budgets"]), set(ENGINES) - {"reference"}
+                )
+
+    @skipUnless(
+        os.environ.get("RUN_TIMING_TESTS"), "RUN_TIMING_TESTS não está definida"
+    )
+    def test_time_budgets(self):
+        for graph_file, timing in TIME_BUDGETS.items():
+            graph = read_graph(repo_data_dir_path / graph_file)
+            reference_time = engine_time(graph, "reference", timing["n_its"])
+            for engine, budget in timing["budgets"].items():
+                with self.subTest(graph=graph_file, engine=engine):
+                    ratio = (
+                        engine_time(graph, engine, timing["n_its"])
+                        / reference_time
+                    )
+                    self.assertLessEqual(
+                        ratio,
+                        budget,
+                        f"{engine} levou {ratio:.2f}x o tempo do reference "
+                        f"({reference_time:.2f}s) em {graph_file}, o limite "
+                        f"é {budget}x",
+                    )
+
+
+if __name__ == "__main__":
+    main()
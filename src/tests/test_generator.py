@@ -0,0 +1,116 @@
+from unittest import main, TestCase
+from generator import (
+    SyntheticGraph,
+    _pairs_to_edges,
+    read_edges_file,
+    write_edges_file,
+)
+from graph import UndirectedGraph
+import pathlib
+import tempfile
+import numpy as np
+
+
+class TestSyntheticGraph(TestCase):
+    def assert_is_clique(self, graph: UndirectedGraph, nodes: list):
+        for node in nodes:
+            neighboors = set(graph.ordered_neighboors(node))
+            for other_node in nodes:
+                if other_node != node:
+                    self.assertIn(other_node, neighboors)
+
+    def test_pairs_to_edges_covers_all_pairs(self):
+        for num_nodes in (2, 3, 7, 50):
+            num_pairs = num_nodes * (num_nodes - 1) // 2
+            edges = _pairs_to_edges(np.arange(num_pairs), num_nodes)
+            expected = [
+                (i, j)
+                for i in range(1, num_nodes + 1)
+                for j in range(i + 1, num_nodes + 1)
+            ]
+            self.assertListEqual([tuple(edge) for edge in edges], expected)
+
+    def test_complete_graph(self):
+        synthetic = SyntheticGraph("gnp", 30, p=1, seed=0)
+        graph = synthetic.to_graph()
+        self.assertEqual(graph.num_edges, 30 * 29 // 2)
+        self.assert_is_clique(graph, list(range(1, 31)))
+
+    def test_planted_clique_is_clique(self):
+        for kind in ("gnp", "brock", "phat"):
+            synthetic = SyntheticGraph(
+                kind, 200, p=0.3, clique_size=12, seed=3
+            )
+            graph = synthetic.to_graph()
+            self.assertEqual(len(synthetic.planted_clique), 12)
+            self.assert_is_clique(graph, synthetic.planted_clique)
+
+    def test_edges_are_unique_and_ordered(self):
+        edges = SyntheticGraph("phat", 300, clique_size=20, seed=1).edges()
+        self.assertTrue(np.all(edges[:, 0] < edges[:, 1]))
+        self.assertEqual(
+            np.unique(edges, axis=0).shape[0], edges.shape[0]
+        )
+
+    def test_same_seed_same_graph(self):
+        first = SyntheticGraph("brock", 150, p=0.4, clique_size=10, seed=5)
+        second = SyntheticGraph("brock", 150, p=0.4, clique_size=10, seed=5)
+        self.assertListEqual(first.planted_clique, second.planted_clique)
+        self.assertTrue(np.array_equal(first.edges(), second.edges()))
+
+    def test_gnp_density(self):
+        edges = SyntheticGraph("gnp", 400, p=0.2, seed=2).edges()
+        density = edges.shape[0] / (400 * 399 / 2)
+        self.assertAlmostEqual(density, 0.2, delta=0.01)
+
+    def test_brock_hides_clique_degree(self):
+        synthetic = SyntheticGraph("brock", 400, p=0.5, clique_size=40, seed=4)
+        graph = synthetic.to_graph()
+        clique = set(synthetic.planted_clique)
+        clique_degrees = [graph.n_neighboors(node) for node in clique]
+        other_degrees = [
+            graph.n_neighboors(node)
+            for node in range(1, 401)
+            if node not in clique
+        ]
+        self.assertAlmostEqual(
+            np.mean(clique_degrees), np.mean(other_degrees), delta=10
+        )
+
+    def test_edges_file_round_trip(self):
+        synthetic = SyntheticGraph("gnp", 100, p=0.1, clique_size=5, seed=6)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = pathlib.Path(tmp_dir) / "graph.edges"
+            num_edges = synthetic.to_edges_file(path)
+            num_nodes, edges = read_edges_file(path)
+
+            self.assertEqual(num_nodes, 100)
+            self.assertEqual(edges.shape[0], num_edges)
+            self.assertTrue(np.array_equal(edges, synthetic.edges()))
+
+            write_edges_file(path, 3, [])
+            num_nodes, edges = read_edges_file(path)
+            self.assertEqual(num_nodes, 3)
+            self.assertEqual(edges.shape[0], 0)
+
+
+class TestGraphFromEdges(TestCase):
+    def test_from_edges_matches_add_edge(self):
+        edges = np.array(
+            [[1, 2], [2, 3], [3, 4], [4, 5], [3, 2], [4, 2], [2, 1], [9, 1]]
+        )
+        graph = UndirectedGraph.from_edges(5, edges)
+        expected = UndirectedGraph(5, 5)
+        for origin_node, dest_node in edges:
+            expected.add_edge(int(origin_node), int(dest_node))
+
+        self.assertEqual(graph.num_edges, 5)
+        for node_id in range(1, 6):
+            self.assertTupleEqual(
+                graph.ordered_neighboors(node_id),
+                expected.ordered_neighboors(node_id),
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -49,5 +49,15 @@ class TestGraph(TestCase):
         graph = UndirectedGraph.from_col_file(test_data_path)
         self.assertIsNone(graph.n_neighboors(17))
 
+    def test_content_hash_ignores_edge_order(self):
+        graph = UndirectedGraph.from_col_file(data_dir_path / "data_test.col")
+        same_graph = UndirectedGraph(3, 3)
+        for origin_node, dest_node in [(3, 2), (3, 1), (2, 1)]:
+            same_graph.add_edge(origin_node, dest_node)
+        self.assertEqual(graph.content_hash(), same_graph.content_hash())
+
+        same_graph.add_edge(1, 1)
+        self.assertNotEqual(graph.content_hash(), same_graph.content_hash())
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,122 @@
+from unittest import main, TestCase
+from graph import UndirectedGraph
+from graph_io import (
+    detect_format,
+    read_graph,
+    read_header,
+    write_dimacs_binary,
+)
+from generator import SyntheticGraph
+import bz2
+import gzip
+import lzma
+import pathlib
+import tempfile
+import numpy as np
+
+data_dir_path = pathlib.Path(__file__).parent / "data"
+
+
+class TestGraphIO(TestCase):
+    def setUp(self):
+        self.col_path = data_dir_path / "graph_10n_10e.col"
+        self.graph = UndirectedGraph.from_col_file(self.col_path)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.tmp_path = pathlib.Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def graph_edges(self, graph: UndirectedGraph) -> np.ndarray:
+        return np.array(
+            [
+                (node_id, neigh)
+                for node_id in range(1, graph.num_nodes + 1)
+                for neigh in graph.ordered_neighboors(node_id)
+                if neigh < node_id
+            ]
+        )
+
+    def assert_same_graph(self, expected, graph):
+        self.assertEqual(expected.num_nodes, graph.num_nodes)
+        for node_id in range(1, expected.num_nodes + 1):
+            self.assertTupleEqual(
+                expected.ordered_neighboors(node_id),
+                graph.ordered_neighboors(node_id),
+            )
+
+    def test_col_file(self):
+        self.assertEqual(detect_format(self.col_path), "col")
+        self.assert_same_graph(self.graph, read_graph(self.col_path))
+        self.assertTupleEqual(read_header(self.col_path), (10, 15))
+
+    def test_compressed_col_files(self):
+        content = self.col_path.read_bytes()
+        for suffix, compress in (
+            (".gz", gzip.compress),
+            (".bz2", bz2.compress),
+            (".xz", lzma.compress),
+        ):
+            path = self.tmp_path / f"graph.col{suffix}"
+            path.write_bytes(compress(content))
+            self.assertEqual(detect_format(path), "col")
+            self.assert_same_graph(self.graph, read_graph(path))
+            self.assertTupleEqual(read_header(path), (10, 15))
+
+    def test_dimacs_binary(self):
+        path = self.tmp_path / "graph.b"
+        write_dimacs_binary(
+            path, 10, self.graph_edges(self.graph), comments=["teste"]
+        )
+        self.assertEqual(detect_format(path), "dimacs_bin")
+        # O cabeçalho do .col diz 15 arestas, mas o arquivo tem 16
+        self.assertTupleEqual(read_header(path), (10, 16))
+        self.assert_same_graph(self.graph, read_graph(path))
+
+        gz_path = self.tmp_path / "graph.b.gz"
+        gz_path.write_bytes(gzip.compress(path.read_bytes()))
+        self.assert_same_graph(self.graph, read_graph(gz_path))
+
+    def test_dimacs_binary_larger_graph(self):
+        synthetic = SyntheticGraph("gnp", 77, p=0.4, seed=2)
+        expected = synthetic.to_graph()
+        path = self.tmp_path / "graph.b"
+        write_dimacs_binary(path, 77, synthetic.edges())
+        graph = read_graph(path)
+        self.assert_same_graph(expected, graph)
+        self.assertEqual(expected.num_edges, graph.num_edges)
+
+    def test_edge_list(self):
+        path = self.tmp_path / "graph.txt"
+        lines = ["# lista de arestas com índices a partir de 0"]
+        lines += [f"{i - 1}\t{j - 1}" for i, j in self.graph_edges(self.graph)]
+        path.write_text("\n".join(lines) + "\n")
+        self.assertEqual(detect_format(path), "edge_list")
+        self.assert_same_graph(self.graph, read_graph(path))
+
+    def test_edge_list_with_count_header(self):
+        path = self.tmp_path / "graph.txt"
+        path.write_text("3\n1 2\n2 3\n1 3\n")
+        self.assertEqual(detect_format(path), "edge_list")
+        self.assertTupleEqual(read_header(path), (3, 3))
+        self.assertEqual(read_graph(path).num_edges, 3)
+
+        # O número de arestas maior que o arquivo não é um preâmbulo.
+        path.write_text("100\n1 2\n2 3\n")
+        self.assertEqual(detect_format(path), "edge_list")
+
+    def test_edges_file(self):
+        synthetic = SyntheticGraph("gnp", 50, p=0.3, seed=1)
+        path = self.tmp_path / "graph.edges"
+        num_edges = synthetic.to_edges_file(path)
+        self.assertEqual(detect_format(path), "edges")
+        self.assertTupleEqual(read_header(path), (50, num_edges))
+        self.assert_same_graph(synthetic.to_graph(), read_graph(path))
+
+        gz_path = self.tmp_path / "graph.edges.gz"
+        gz_path.write_bytes(gzip.compress(path.read_bytes()))
+        self.assert_same_graph(synthetic.to_graph(), read_graph(gz_path))
+
+
+if __name__ == "__main__":
+    main()
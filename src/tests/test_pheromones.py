@@ -0,0 +1,151 @@
+from unittest import main, TestCase
+from graph import UndirectedGraph
+from aco import ACOMaxClique, TauRange
+from pheromones import LazyPheromones, VertexPheromones
+import pathlib
+import numpy as np
+
+data_dir_path = pathlib.Path(__file__).parent / "data"
+
+
+class TestLazyPheromones(TestCase):
+    def setUp(self):
+        test_data_path = data_dir_path / "graph_10n_10e.col"
+        self.graph = UndirectedGraph.from_col_file(test_data_path)
+        self.t_range = TauRange(0.1, 0.9)
+        self.eager_aco = ACOMaxClique(
+            self.graph, 10, 10, 0.05, self.t_range, 1
+        )
+        self.lazy_aco = ACOMaxClique(
+            self.graph, 10, 10, 0.05, self.t_range, 1, lazy_evap=True
+        )
+
+    def assert_same_pheromones(self, eager, lazy):
+        self.assertEqual(len(eager), len(lazy))
+        for eager_array, lazy_array in zip(eager, lazy):
+            self.assertTrue(np.allclose(eager_array, lazy_array))
+
+    def test_init_matches_eager(self):
+        eager = self.eager_aco._init_pheromones()
+        lazy = self.lazy_aco._init_pheromones()
+        self.assertIsInstance(lazy, LazyPheromones)
+        self.assert_same_pheromones(eager, lazy)
+
+    def test_evaporate_and_deposit_match_eager(self):
+        eager = self.eager_aco._init_pheromones()
+        lazy = self.lazy_aco._init_pheromones()
+        cliques = [[4, 6, 7], [2, 3, 5, 9], [2, 4], [4, 6, 7]]
+
+        for it in range(60):
+            self.eager_aco._evaporate_pheromones(eager)
+            self.lazy_aco._evaporate_pheromones(lazy)
+
+            if it % 5 == 0:
+                clique = cliques[it % len(cliques)]
+                self.eager_aco._deposit_pheromones(eager, clique, clique)
+                self.lazy_aco._deposit_pheromones(lazy, clique, clique)
+
+            self.assert_same_pheromones(eager, lazy)
+
+    def test_pheromone_never_below_t_min(self):
+        lazy = self.lazy_aco._init_pheromones()
+        for _ in range(200):
+            lazy.evaporate(0.5)
+
+        for node_pheromones in lazy:
+            self.assertTrue((node_pheromones == self.t_range.t_min).all())
+        self.assertAlmostEqual(lazy.mean(), self.t_range.t_min)
+
+    def test_mean_matches_materialized_mean(self):
+        lazy = self.lazy_aco._init_pheromones()
+        cliques = [[4, 6, 7], [2, 3, 5, 9], [2, 4], [4, 6, 7]]
+
+        for it in range(400):
+            lazy.evaporate(0.1 if it % 50 < 15 else 0.95)
+            if it % 3 == 0:
+                clique = cliques[it % len(cliques)]
+                self.lazy_aco._deposit_pheromones(lazy, clique, clique)
+
+            materialized = np.concatenate(list(lazy))
+            self.assertAlmostEqual(lazy.mean(), materialized.mean())
+
+    def test_renormalize_keeps_values(self):
+        lazy = self.lazy_aco._init_pheromones()
+        lazy.evaporate(0.95)
+        lazy.add(1, 0, 0.3)
+        before = [node_pheromones.copy() for node_pheromones in lazy]
+        lazy.renormalize()
+        self.assert_same_pheromones(before, lazy)
+
+    def test_to_array_does_not_mutate(self):
+        lazy = self.lazy_aco._init_pheromones()
+        lazy.evaporate(0.95)
+        lazy.add(1, 0, 0.3)
+        stored = lazy._values.copy()
+        pheromones_array = lazy.to_array()
+        pheromones_array.fill(0)
+
+        self.assertTrue((lazy._values == stored).all())
+        self.assertAlmostEqual(lazy.pheromone(0, 0), 0.9 * 0.95)
+
+    def test_can_find_maximum_clique_lazy(self):
+        maximum_clique_found = self.lazy_aco.find_maximum_clique()
+        self.assertTrue(len(maximum_clique_found) == 4)
+
+
+class TestVertexPheromones(TestCase):
+    def setUp(self):
+        test_data_path = data_dir_path / "graph_10n_10e.col"
+        self.graph = UndirectedGraph.from_col_file(test_data_path)
+        self.t_max = 0.9
+        self.t_range = TauRange(0.1, self.t_max)
+        self.aco = ACOMaxClique(
+            self.graph, 10, 10, 0.05, self.t_range, 1,
+            pheromone_model="vertex",
+        )
+
+    def test_init_one_pheromone_per_vertex(self):
+        pheromones = self.aco._init_pheromones()
+        self.assertIsInstance(pheromones, VertexPheromones)
+        self.assertEqual(len(pheromones), self.graph.num_nodes)
+        self.assertTrue(all(p == self.t_max for p in pheromones))
+
+    def test_tau_factor_is_vertex_pheromone(self):
+        pheromones = self.aco._init_pheromones()
+        pheromones.evaporate(0.5)
+        pheromones.deposit([2], 0.2)
+        candidates = list(self.graph.ordered_neighboors(3))
+        cands_t_factor = self.aco._initialize_tau_factor(
+            candidates, pheromones, 3
+        )
+        expected = {cand: 0.45 for cand in candidates}
+        expected[2] = 0.65
+        for cand, t_factor in expected.items():
+            self.assertAlmostEqual(t_factor, cands_t_factor[cand])
+
+    def test_deposit_only_clique_vertices(self):
+        pheromones = self.aco._init_pheromones()
+        self.aco._evaporate_pheromones(pheromones)
+        self.aco._deposit_pheromones(pheromones, [4, 6, 7], [2, 3, 5, 9])
+
+        evaporated = self.t_max * 0.95
+        for node_idx, pheromone in enumerate(pheromones):
+            if node_idx + 1 in (4, 6, 7):
+                self.assertAlmostEqual(pheromone, min(evaporated + 0.5, 0.9))
+            else:
+                self.assertAlmostEqual(pheromone, evaporated)
+
+    def test_lazy_evap_requires_edge_model(self):
+        with self.assertRaises(ValueError):
+            ACOMaxClique(
+                self.graph, 10, 10, 0.05, self.t_range, 1,
+                lazy_evap=True, pheromone_model="vertex",
+            )
+
+    def test_can_find_maximum_clique_vertex(self):
+        maximum_clique_found = self.aco.find_maximum_clique()
+        self.assertTrue(len(maximum_clique_found) == 4)
+
+
+if __name__ == "__main__":
+    main()
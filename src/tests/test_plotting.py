@@ -0,0 +1,60 @@
+from unittest import main, TestCase
+import matplotlib
+
+matplotlib.use("Agg")
+
+from plotting import band_stats, lttb_indices, minmax_band, render_sweep_folder
+import pathlib
+import tempfile
+import numpy as np
+
+
+class TestPlotting(TestCase):
+    def test_band_stats(self):
+        values = [[1, 3], [2, 2], [0, 4]]
+        mean, std, min_values, max_values = band_stats(values)
+        self.assertListEqual(mean.tolist(), [2, 2, 2])
+        self.assertListEqual(std.tolist(), [1, 0, 2])
+        self.assertListEqual(min_values.tolist(), [1, 2, 0])
+        self.assertListEqual(max_values.tolist(), [3, 2, 4])
+
+    def test_lttb_keeps_ends_and_peak(self):
+        y = np.zeros(1000)
+        y[437] = 10
+        x = np.arange(1000)
+        idxs = lttb_indices(x, y, 50)
+        self.assertEqual(len(idxs), 50)
+        self.assertEqual(idxs[0], 0)
+        self.assertEqual(idxs[-1], 999)
+        self.assertIn(437, idxs)
+        self.assertTrue(np.all(np.diff(idxs) > 0))
+
+    def test_lttb_small_series_unchanged(self):
+        self.assertListEqual(lttb_indices(range(5), range(5), 10).tolist(), list(range(5)))
+
+    def test_minmax_band_keeps_envelope(self):
+        x = np.arange(1000)
+        y1 = np.sin(x / 10)
+        y2 = y1 + 1
+        band_x, band_y1, band_y2 = minmax_band(x, y1, y2, 20)
+        self.assertEqual(len(band_x), 21)
+        self.assertAlmostEqual(band_y1.min(), y1.min())
+        self.assertAlmostEqual(band_y2.max(), y2.max())
+
+    def test_render_skips_unchanged_inputs(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            folder = pathlib.Path(tmp_dir) / "sweep"
+            folder.mkdir()
+            header = "it,max_clique,max_cycle_clique,mean_p,similarity,re_samp_ratio\n"
+            for run_id in range(2):
+                lines = [f"{it},{it},{it},0.5,0.1,0.0\n" for it in range(1, 30)]
+                (folder / f"run_{run_id}.csv").write_text(header + "".join(lines))
+
+            fig_path = pathlib.Path(tmp_dir) / "figs" / "sweep.png"
+            self.assertTrue(render_sweep_folder(folder, fig_path, max_points=10))
+            self.assertTrue(fig_path.is_file())
+            self.assertFalse(render_sweep_folder(folder, fig_path, max_points=10))
+            self.assertTrue(render_sweep_folder(folder, fig_path, max_points=20))
+
+if __name__ == "__main__":
+    main()
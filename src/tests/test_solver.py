@@ -0,0 +1,95 @@
+from unittest import main, TestCase
+from solver import LRUCache, MaxCliqueSolver
+import io
+import json
+import pathlib
+import tempfile
+
+data_dir_path = pathlib.Path(__file__).parent / "data"
+
+
+class TestLRUCache(TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+        self.assertEqual(len(cache), 2)
+
+
+class TestMaxCliqueSolver(TestCase):
+    def setUp(self):
+        self.data_path = data_dir_path / "graph_10n_10e.col"
+        self.solver = MaxCliqueSolver()
+
+    def test_solve_returns_clique_and_stats(self):
+        result = self.solver.solve(self.data_path, n_its=10, seed=1)
+        self.assertEqual(result["size"], len(result["clique"]))
+        self.assertEqual(result["its"], 10)
+        self.assertFalse(result["graph_cached"])
+        self.assertFalse(result["warm"])
+
+    def test_graph_and_pheromones_are_cached(self):
+        self.solver.solve(self.data_path, n_its=5)
+        result = self.solver.solve(self.data_path, n_its=5, warm=True)
+        self.assertTrue(result["graph_cached"])
+        self.assertTrue(result["warm"])
+
+    def test_same_seed_same_result(self):
+        first = self.solver.solve(self.data_path, n_its=10, seed=3)
+        second = self.solver.solve(self.data_path, n_its=10, seed=3)
+        self.assertListEqual(first["clique"], second["clique"])
+
+    def test_deadline_stops_early(self):
+        result = self.solver.solve(self.data_path, n_its=10000, deadline=0)
+        self.assertEqual(result["its"], 1)
+
+    def test_serve_jsonl(self):
+        requests = [
+            {"id": 1, "data_path": str(self.data_path), "n_its": 5},
+            {"id": 2, "data_path": str(self.data_path), "t_min": 2.0},
+            {"id": 3, "data_path": "nao_existe.col"},
+        ]
+        in_stream = io.StringIO(
+            "\n".join(json.dumps(request) for request in requests) + "\nxx\n"
+        )
+        out_stream = io.StringIO()
+        self.solver.serve_jsonl(in_stream, out_stream)
+
+        responses = [
+            json.loads(line) for line in out_stream.getvalue().splitlines()
+        ]
+        self.assertEqual([r["id"] for r in responses], [1, 2, 3, None])
+        self.assertListEqual(
+            [r["ok"] for r in responses], [True, False, False, False]
+        )
+        self.assertEqual(responses[0]["result"]["its"], 5)
+
+    def test_bad_requests_do_not_stop_the_service(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            bad_col = pathlib.Path(tmp_dir) / "bad.col"
+            bad_col.write_text("e 1 2\np edge 2 1\n")
+            lines = [
+                "[1, 2]",
+                '"abc"',
+                json.dumps({"id": 1, "data_path": str(bad_col)}),
+                json.dumps({"id": 2, "data_path": str(self.data_path), "n_its": 2}),
+            ]
+            out_stream = io.StringIO()
+            self.solver.serve_jsonl(io.StringIO("\n".join(lines)), out_stream)
+
+        responses = [
+            json.loads(line) for line in out_stream.getvalue().splitlines()
+        ]
+        self.assertListEqual(
+            [r["ok"] for r in responses], [False, False, False, True]
+        )
+        self.assertEqual(responses[3]["id"], 2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+from unittest import main, TestCase
+from aco import ACOMaxClique, TauRange
+from graph import UndirectedGraph
+from telemetry import TelemetryAggregator, TelemetryReporter
+import json
+import pathlib
+import queue
+import socket
+import tempfile
+import time
+import urllib.request
+
+data_dir_path = pathlib.Path(__file__).parent / "data"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestTelemetryReporter(TestCase):
+    def test_sends_every_n_iterations(self):
+        telemetry_queue = queue.Queue()
+        reporter = TelemetryReporter(telemetry_queue, "0", n_ants=10, every=2)
+        for it in range(1, 6):
+            reporter(it, [1, 2, 3], [1, 2], 0.5, 0.1)
+
+        messages = [telemetry_queue.get_nowait() for _ in range(2)]
+        self.assertTrue(telemetry_queue.empty())
+        self.assertEqual([message["it"] for message in messages], [2, 4])
+        self.assertEqual(messages[0]["best"], 3)
+        self.assertEqual(messages[0]["cycle_best"], 2)
+        self.assertAlmostEqual(messages[0]["ants_per_sec"], 100)
+
+    def test_drops_messages_when_queue_is_full(self):
+        telemetry_queue = queue.Queue(1)
+        reporter = TelemetryReporter(telemetry_queue, "0", n_ants=10)
+        reporter(1, [1], [1], 0.5, 0.1)
+        reporter(2, [1], [1], 0.5, 0.1)
+        self.assertEqual(telemetry_queue.get_nowait()["it"], 1)
+
+
+class TestTelemetryAggregator(TestCase):
+    def test_logs_and_serves_latest_metrics(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = pathlib.Path(tmp_dir) / "telemetry.jsonl"
+            socket_path = pathlib.Path(tmp_dir) / "telemetry.sock"
+            port = free_port()
+            telemetry_queue = queue.Queue()
+            aggregator = TelemetryAggregator(
+                telemetry_queue, log_path, port, socket_path
+            )
+            aggregator.start()
+
+            reporter = TelemetryReporter(telemetry_queue, "a/0", n_ants=5)
+            for it in range(1, 4):
+                reporter(it, [1, 2], [1], 0.5, 0.01)
+            deadline = time.monotonic() + 5
+            while aggregator.snapshot().get("a/0", {}).get("it") != 3:
+                self.assertLess(time.monotonic(), deadline)
+                time.sleep(0.01)
+
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/") as response:
+                http_snapshot = json.loads(response.read())
+
+            with socket.socket(socket.AF_UNIX) as sock:
+                sock.connect(str(socket_path))
+                socket_snapshot = json.loads(sock.makefile().readline())
+
+            aggregator.stop()
+
+            self.assertEqual(aggregator.snapshot()["a/0"]["it"], 3)
+            self.assertIn("seconds_since_update", http_snapshot["a/0"])
+            self.assertEqual(set(socket_snapshot), {"a/0"})
+            with open(log_path) as log_file:
+                self.assertEqual(len(log_file.readlines()), 3)
+            self.assertFalse(socket_path.exists())
+
+    def test_start_raises_when_port_is_in_use(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            sock.listen()
+            aggregator = TelemetryAggregator(
+                queue.Queue(), http_port=sock.getsockname()[1]
+            )
+            with self.assertRaises(OSError):
+                aggregator.start()
+
+    def test_start_raises_when_log_is_unwritable(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # O log é um diretório, então não pode ser aberto para escrita.
+            aggregator = TelemetryAggregator(queue.Queue(5), tmp_dir)
+            with self.assertRaises(OSError):
+                aggregator.start()
+
+    def test_stop_returns_when_thread_died_with_full_queue(self):
+        telemetry_queue = queue.Queue(5)
+        aggregator = TelemetryAggregator(telemetry_queue)
+        aggregator.start()
+        telemetry_queue.put(None)
+        aggregator._thread.join(timeout=5)
+        self.assertFalse(aggregator._thread.is_alive())
+
+        for _ in range(5):
+            telemetry_queue.put_nowait({"run": "a/0"})
+        aggregator.stop()
+
+
+class TestOnIteration(TestCase):
+    def test_called_once_per_iteration(self):
+        graph = UndirectedGraph.from_col_file(data_dir_path / "graph_10n_10e.col")
+        aco = ACOMaxClique(graph, 5, 7, 0.1, TauRange(0.1, 0.9), 1)
+        calls = list()
+        aco.find_maximum_clique(
+            on_iteration=lambda it, best, cycle_best, mean_p, it_time: calls.append(it)
+        )
+        self.assertEqual(calls, list(range(7)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+from unittest import main, TestCase
+from multiprocessing import pool
+from tuner import (
+    Config,
+    chi2_sf,
+    config_grid,
+    friedman_survivors,
+    init_tuner,
+    instance_class,
+    race,
+    rank_rows,
+)
+import math
+import pathlib
+import numpy as np
+
+data_dir_path = pathlib.Path(__file__).parent / "data"
+
+
+class TestTuner(TestCase):
+    def test_config_grid(self):
+        configs = config_grid([5, 10], [0.05], [1, 2], [(0.1, 0.9)])
+        self.assertEqual(len(configs), 4)
+        self.assertEqual(configs[0], Config(5, 0.05, 1, 0.1, 0.9))
+        self.assertEqual(configs[0].t_range.t_max, 0.9)
+
+    def test_config_grid_rejects_invalid_t_range(self):
+        with self.assertRaises(ValueError):
+            config_grid([5], [0.05], [1], [(0.9, 0.1)])
+
+    def test_instance_class(self):
+        self.assertEqual(instance_class("brock800_4"), "brock800")
+        self.assertEqual(instance_class("p_hat700-2"), "p_hat700")
+        self.assertEqual(instance_class("dsjc500.5"), "dsjc500")
+        self.assertEqual(instance_class("keller4"), "keller4")
+
+    def test_rank_rows_averages_ties(self):
+        ranks = rank_rows([[3, 5, 3], [1, 2, 3]])
+        np.testing.assert_array_equal(ranks, [[2.5, 1, 2.5], [3, 2, 1]])
+
+    def test_chi2_sf(self):
+        self.assertAlmostEqual(chi2_sf(2, 2), math.exp(-1))
+        self.assertAlmostEqual(chi2_sf(3.841459, 1), 0.05, places=6)
+        self.assertAlmostEqual(chi2_sf(7.814728, 3), 0.05, places=6)
+        self.assertAlmostEqual(chi2_sf(11.070498, 5), 0.05, places=6)
+        self.assertEqual(chi2_sf(0, 4), 1.0)
+
+    def test_friedman_drops_worse_configs(self):
+        scores = np.array([[10, 10, 5]] * 8) + np.arange(8)[:, None]
+        self.assertListEqual(friedman_survivors(scores, 0.05), [0, 1])
+
+    def test_friedman_keeps_all_when_tied(self):
+        scores = np.full((8, 3), 4)
+        self.assertListEqual(friedman_survivors(scores, 0.05), [0, 1, 2])
+
+    def test_race(self):
+        configs = config_grid([2, 5], [0.05, 0.5], [1], [(0.1, 0.9)])
+        instances = [data_dir_path / "graph_10n_10e.col"]
+        with pool.Pool(initializer=init_tuner, processes=1) as runs_pool:
+            result = race(
+                configs, instances, runs_pool, n_its=5, n_seeds=3, first_test=2
+            )
+            same_result = race(
+                configs, instances, runs_pool, n_its=5, n_seeds=3, first_test=2
+            )
+
+        self.assertIn(result["config"], configs)
+        self.assertEqual(result["blocks"], 3)
+        self.assertLessEqual(result["evaluations"], result["grid_evaluations"])
+        self.assertEqual(result, same_result)
+
+    def test_race_stops_at_max_evaluations(self):
+        configs = config_grid([2, 5], [0.05, 0.5], [1], [(0.1, 0.9)])
+        instances = [data_dir_path / "graph_10n_10e.col"]
+        with pool.Pool(initializer=init_tuner, processes=1) as runs_pool:
+            result = race(
+                configs, instances, runs_pool, n_its=5, n_seeds=10,
+                max_evaluations=9,
+            )
+        self.assertEqual(result["evaluations"], 8)
+        self.assertEqual(result["blocks"], 2)
+
+
+if __name__ == "__main__":
+    main()
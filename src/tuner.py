@@ -0,0 +1,463 @@
+import argparse
+import itertools
+import math
+import pathlib
+import random
+import re
+import statistics
+import time
+from multiprocessing import pool
+from typing import NamedTuple
+import numpy as np
+from aco import TauRange, ACOMaxClique, validate_params
+from solver import LRUCache
+from graph_io import read_graph
+from batch import list_instances
+
+TUNING_HEADER = (
+    "class instances n_ants evap_r alpha t_min t_max mean_size mean_rank "
+    "blocks evaluations grid_evaluations"
+).split()
+
+
+class Config(NamedTuple):
+    """
+    Uma configuração de parâmetros do ACOMaxClique avaliada pelo tuner.
+    """
+
+    n_ants: int
+    evap_r: float
+    alpha: int
+    t_min: float
+    t_max: float
+
+    @property
+    def t_range(self) -> TauRange:
+        return TauRange(self.t_min, self.t_max)
+
+
+def config_grid(
+    n_ants_values: list, evap_r_values: list, alpha_values: list, t_ranges: list
+) -> list[Config]:
+    """
+    Retorna todas as combinações dos valores, com t_ranges uma lista de pares
+    (t_min, t_max).
+    """
+    configs = [
+        Config(n_ants, evap_r, alpha, t_min, t_max)
+        for n_ants, evap_r, alpha, (t_min, t_max) in itertools.product(
+            n_ants_values, evap_r_values, alpha_values, t_ranges
+        )
+    ]
+    for config in configs:
+        validate_params(
+            config.t_min, config.t_max, config.evap_r, config.n_ants, 1,
+            config.alpha,
+        )
+    return configs
+
+
+def instance_class(name: str) -> str:
+    """
+    Classe de uma instância: o nome sem o sufixo numérico da variante, como
+    nas famílias do DIMACS (brock800_4 -> brock800, p_hat700-2 -> p_hat700,
+    dsjc500.5 -> dsjc500).
+    """
+    return re.sub(r"[-_.]\d+$", "", name)
+
+
+def group_instances(data_path: pathlib.Path) -> dict:
+    """
+    Lê as instâncias de data_path (diretório ou manifesto, como no batch) e
+    as agrupa por instance_class.
+    """
+    classes = dict()
+    for instance in list_instances(data_path):
+        classes.setdefault(instance_class(instance.name), list()).append(
+            instance.path
+        )
+    return classes
+
+
+def rank_rows(scores: np.ndarray) -> np.ndarray:
+    """
+    Ranqueia as configurações (colunas) em cada bloco (linha) de scores, com
+    rank 1 para o maior score e a média dos ranks para empates.
+    """
+    scores = np.asarray(scores, dtype=float)
+    ranks = np.empty_like(scores)
+    for row_idx, row in enumerate(-scores):
+        order = np.argsort(row, kind="stable")
+        _, inverse, counts = np.unique(
+            row[order], return_inverse=True, return_counts=True
+        )
+        ends = np.cumsum(counts)
+        mean_ranks = (ends - counts + 1 + ends) / 2
+        ranks[row_idx, order] = mean_ranks[inverse]
+    return ranks
+
+
+def chi2_sf(x: float, df: int) -> float:
+    """
+    P(X >= x) para X com distribuição qui-quadrado com df graus de
+    liberdade inteiros, pelas fórmulas fechadas para df par e ímpar.
+    """
+    if x <= 0:
+        return 1.0
+
+    half_x = x / 2
+    if df % 2 == 0:
+        term = total = 1.0
+        for i in range(1, df // 2):
+            term *= half_x / i
+            total += term
+        return min(math.exp(-half_x) * total, 1.0)
+
+    term = math.sqrt(x)
+    total = 0.0
+    for i in range(1, (df - 1) // 2 + 1):
+        total += term
+        term *= x / (2 * i + 1)
+    return min(
+        math.erfc(math.sqrt(half_x))
+        + math.sqrt(2 / math.pi) * math.exp(-half_x) * total,
+        1.0,
+    )
+
+
+def friedman_survivors(scores: np.ndarray, significance: float) -> list[int]:
+    """
+    Teste de Friedman do F-race sobre scores (blocos x configurações). Se as
+    configurações não são todas equivalentes, retorna apenas as colunas cuja
+    soma de ranks não é significativamente pior que a da melhor, pelo teste
+    post-hoc de Conover com a aproximação normal da distribuição t.
+    Senão, retorna todas as colunas.
+    """
+    n_blocks, n_configs = scores.shape
+    all_configs = list(range(n_configs))
+    if n_blocks < 2 or n_configs < 2:
+        return all_configs
+
+    ranks = rank_rows(scores)
+    rank_sums = ranks.sum(axis=0)
+    a = (ranks ** 2).sum()
+    c = n_blocks * n_configs * (n_configs + 1) ** 2 / 4
+    if a - c <= 0:
+        return all_configs
+
+    statistic = (n_configs - 1) * (
+        (rank_sums - n_blocks * (n_configs + 1) / 2) ** 2
+    ).sum() / (a - c)
+    if chi2_sf(statistic, n_configs - 1) >= significance:
+        return all_configs
+
+    critical = statistics.NormalDist().inv_cdf(1 - significance / 2)
+    variance = (
+        2 * n_blocks * (1 - statistic / (n_blocks * (n_configs - 1))) * (a - c)
+        / ((n_blocks - 1) * (n_configs - 1))
+    )
+    max_diff = critical * math.sqrt(max(variance, 0))
+    best = rank_sums.min()
+    return [j for j in all_configs if rank_sums[j] - best <= max_diff]
+
+
+def init_tuner(max_graphs: int = 2):
+    global worker_graphs
+    worker_graphs = LRUCache(max_graphs)
+
+
+def evaluate(task: tuple) -> tuple:
+    """
+    Executa uma run de config na instância e seed do bloco e retorna
+    (índice da configuração, índice do bloco, tamanho do clique). Todas as
+    configurações usam a mesma seed em um bloco.
+    """
+    config_idx, config, block_idx, data_path, seed, n_its = task
+    graph = worker_graphs.get(data_path)
+    if graph is None:
+        graph = read_graph(pathlib.Path(data_path))
+        worker_graphs.put(data_path, graph)
+
+    random.seed(seed)
+    aco = ACOMaxClique(
+        graph, config.n_ants, n_its, config.evap_r, config.t_range, config.alpha
+    )
+    return config_idx, block_idx, len(aco.find_maximum_clique())
+
+
+def race(
+    configs: list[Config],
+    instances: list,
+    runs_pool,
+    n_its: int = 100,
+    n_seeds: int = 10,
+    first_test: int = 5,
+    significance: float = 0.05,
+    max_evaluations: int = None,
+    seed: int = 0,
+) -> dict:
+    """
+    F-race das configs nas instâncias de uma classe. Um bloco é um par
+    (instância, seed); a cada passo as configurações vivas rodam em um bloco
+    novo de cada instância e, a partir de first_test blocos, as que o teste
+    de Friedman aponta como piores são descartadas. Termina quando resta uma
+    configuração, os n_seeds blocos de cada instância acabam ou o próximo
+    passo passaria de max_evaluations runs.
+    Retorna um dicionário com a melhor configuração e estatísticas da corrida.
+    """
+    rng = random.Random(seed)
+    blocks = [
+        (str(path), rng.randrange(2**32))
+        for _ in range(n_seeds)
+        for path in instances
+    ]
+
+    alive = list(range(len(configs)))
+    scores = dict()
+    n_blocks = 0
+    evaluations = 0
+    while n_blocks < len(blocks) and (n_blocks == 0 or len(alive) > 1):
+        new_blocks = range(
+            n_blocks, min(n_blocks + len(instances), len(blocks))
+        )
+        tasks = [
+            (
+                config_idx,
+                configs[config_idx],
+                block_idx,
+                *blocks[block_idx],
+                n_its,
+            )
+            for block_idx in new_blocks
+            for config_idx in alive
+        ]
+        if (
+            max_evaluations is not None
+            and evaluations + len(tasks) > max_evaluations
+        ):
+            break
+
+        for config_idx, block_idx, size in runs_pool.imap_unordered(
+            evaluate, tasks
+        ):
+            scores[config_idx, block_idx] = size
+        evaluations += len(tasks)
+        n_blocks = new_blocks.stop
+
+        if n_blocks >= first_test:
+            alive = [
+                alive[j]
+                for j in friedman_survivors(
+                    _score_matrix(scores, alive, n_blocks), significance
+                )
+            ]
+
+    if n_blocks == 0:
+        raise ValueError("max_evaluations não permite avaliar nenhum bloco!")
+
+    matrix = _score_matrix(scores, alive, n_blocks)
+    mean_ranks = rank_rows(matrix).mean(axis=0)
+    mean_sizes = matrix.mean(axis=0)
+    best = min(range(len(alive)), key=lambda j: (mean_ranks[j], -mean_sizes[j]))
+
+    return {
+        "config": configs[alive[best]],
+        "mean_size": float(mean_sizes[best]),
+        "mean_rank": float(mean_ranks[best]),
+        "alive": [configs[config_idx] for config_idx in alive],
+        "blocks": n_blocks,
+        "evaluations": evaluations,
+        "grid_evaluations": len(configs) * len(blocks),
+    }
+
+
+def _score_matrix(scores: dict, alive: list, n_blocks: int) -> np.ndarray:
+    return np.array(
+        [
+            [scores[config_idx, block_idx] for config_idx in alive]
+            for block_idx in range(n_blocks)
+        ],
+        dtype=float,
+    )
+
+
+def tune(
+    classes: dict,
+    configs: list[Config],
+    n_p: int = 1,
+    **race_kwargs,
+) -> dict:
+    """
+    Executa uma corrida por classe de instâncias em um único pool de n_p
+    processos, e retorna o resultado de race por classe.
+    """
+    results = dict()
+    with pool.Pool(initializer=init_tuner, processes=max(n_p, 1)) as runs_pool:
+        for class_name, instances in classes.items():
+            results[class_name] = race(
+                configs, instances, runs_pool, **race_kwargs
+            )
+    return results
+
+
+def tuning_rows(classes: dict, results: dict) -> list[list]:
+    """
+    Retorna uma linha, na ordem de TUNING_HEADER, por classe.
+    """
+    rows = list()
+    for class_name, result in results.items():
+        config = result["config"]
+        rows.append(
+            [
+                class_name,
+                len(classes[class_name]),
+                config.n_ants,
+                config.evap_r,
+                config.alpha,
+                config.t_min,
+                config.t_max,
+                round(result["mean_size"], 3),
+                round(result["mean_rank"], 3),
+                result["blocks"],
+                result["evaluations"],
+                result["grid_evaluations"],
+            ]
+        )
+    return rows
+
+
+def parse_t_range(value: str) -> tuple:
+    t_min, t_max = value.split(":")
+    return float(t_min), float(t_max)
+
+
+if __name__ == "__main__":
+    from batch import write_summary, print_summary
+
+    parser = argparse.ArgumentParser(description="MaxCliqueACO racing tuner")
+    parser.add_argument(
+        "--data_path",
+        required=True,
+        type=str,
+        help="Dir of instances or manifest file, grouped into classes by name",
+    )
+
+    parser.add_argument(
+        "--n_ants",
+        nargs="+",
+        default=[5, 10, 20],
+        type=int,
+        help="Candidate numbers of ants (int list, default: 5 10 20)",
+    )
+
+    parser.add_argument(
+        "--evap_r",
+        nargs="+",
+        default=[0.01, 0.05, 0.1, 0.2],
+        type=float,
+        help="Candidate evaporation rates (float list, default: 0.01 0.05 0.1 0.2)",
+    )
+
+    parser.add_argument(
+        "--alpha",
+        nargs="+",
+        default=[1, 2, 3],
+        type=int,
+        help="Candidate pheromone weights (int list, default: 1 2 3)",
+    )
+
+    parser.add_argument(
+        "--t_range",
+        nargs="+",
+        default=[(0.1, 0.9)],
+        type=parse_t_range,
+        help="Candidate t_min:t_max pairs (str list, default: 0.1:0.9)",
+    )
+
+    parser.add_argument(
+        "--n_its",
+        required=False,
+        default=100,
+        type=int,
+        help="Iterations of each run (int, default: 100)",
+    )
+
+    parser.add_argument(
+        "--n_seeds",
+        required=False,
+        default=10,
+        type=int,
+        help="Max seeds per instance (int, default: 10)",
+    )
+
+    parser.add_argument(
+        "--first_test",
+        required=False,
+        default=5,
+        type=int,
+        help="Blocks before the first Friedman test (int, default: 5)",
+    )
+
+    parser.add_argument(
+        "--significance",
+        required=False,
+        default=0.05,
+        type=float,
+        help="Significance level of the tests (float, default: 0.05)",
+    )
+
+    parser.add_argument(
+        "--max_evaluations",
+        required=False,
+        default=None,
+        type=int,
+        help="Max runs per class (int, default: None)",
+    )
+
+    parser.add_argument(
+        "--seed",
+        required=False,
+        default=0,
+        type=int,
+        help="Seed of the block seeds (int, default: 0)",
+    )
+
+    parser.add_argument(
+        "--n_p",
+        required=False,
+        default=1,
+        type=int,
+        help="Max number of processes to use (int, default: 1)",
+    )
+
+    parser.add_argument(
+        "--t_dir",
+        required=False,
+        default="./results",
+        type=str,
+        help="Where to save <timestr>/tuning.csv (str, default: ./results)",
+    )
+    args = parser.parse_args()
+
+    configs = config_grid(args.n_ants, args.evap_r, args.alpha, args.t_range)
+    classes = group_instances(args.data_path)
+    results = tune(
+        classes,
+        configs,
+        args.n_p,
+        n_its=args.n_its,
+        n_seeds=args.n_seeds,
+        first_test=args.first_test,
+        significance=args.significance,
+        max_evaluations=args.max_evaluations,
+        seed=args.seed,
+    )
+
+    rows = tuning_rows(classes, results)
+    tuning_path = (
+        pathlib.Path(args.t_dir)
+        / time.strftime("%Y%m%d-%H%M%S")
+        / "tuning.csv"
+    )
+    write_summary(tuning_path, rows, header=TUNING_HEADER)
+    print_summary(rows, TUNING_HEADER)